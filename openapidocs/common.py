@@ -1,16 +1,23 @@
 import base64
-import copy
+import sys
 from abc import ABC, abstractmethod
-from dataclasses import asdict, fields, is_dataclass
+from dataclasses import asdict, dataclass, fields, is_dataclass
 from datetime import date, datetime, time
 from enum import Enum
-from typing import Any, List, Tuple
+from functools import lru_cache, partial
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from uuid import UUID
 
 import yaml
-from essentials.json import dumps
 
-from openapidocs.mk.contents import OADJSONEncoder
+from openapidocs.mk.contents import BUILTIN_TYPES_CONVERTERS, write_json
+
+try:
+    # use the libyaml emitter, when PyYAML is compiled with its bindings
+    from yaml import CDumper as YAMLDumper
+except ImportError:  # pragma: no cover
+    from yaml import Dumper as YAMLDumper  # type: ignore
 
 
 class Format(Enum):
@@ -21,10 +28,23 @@ class Format(Enum):
 class OpenAPIElement:
     """Base class for all OpenAPI Elements"""
 
+    __slots__ = ()
+
 
 class OpenAPIRoot(OpenAPIElement):
     """Base class for a root OpenAPI Documentation"""
 
+    __slots__ = ()
+
+
+if sys.version_info >= (3, 10):
+    # instances of slotted dataclasses don't have a __dict__: they use less memory and
+    # their attributes are faster to read, which matters for documents with many
+    # elements. The slots option of dataclasses requires Python 3.10.
+    slots_dataclass = partial(dataclass, slots=True)
+else:  # pragma: no cover
+    slots_dataclass = dataclass
+
 
 class ValueTypeHandler(ABC):
     @abstractmethod
@@ -57,14 +77,102 @@ class CommonBuiltInTypesHandler(ValueTypeHandler):
 
 TYPES_HANDLERS = [CommonBuiltInTypesHandler()]
 
+# the lookups by type below replicate the default handlers: they are used only as long
+# as TYPES_HANDLERS is not customized, so that custom handlers apply to all values
+_default_types_handlers = TYPES_HANDLERS.copy()
+
+
+def _uses_default_types_handlers() -> bool:
+    return TYPES_HANDLERS == _default_types_handlers
+
+
+# converters for the built-in types handled by CommonBuiltInTypesHandler, looked up
+# by exact type to avoid running a chain of isinstance checks for each value; the
+# shared table is copied, since enum types are added when first normalized
+_BUILTIN_CONVERTERS: Dict[type, Callable[[Any], Any]] = BUILTIN_TYPES_CONVERTERS.copy()
+
+# reads the value of enum members from the attribute behind their `value` property,
+# which is much faster to access (e.g. for the types of security schemes)
+_enum_value = attrgetter("_value_")
+
+# types of values that are represented as they are, by all steps of serialization
+_SCALAR_TYPES = frozenset({str, int, float, bool})
+
+_PLAIN_TYPES = frozenset({str, int, float, bool, type(None), list, dict})
+
+# immutable types that don't need to be copied when creating dictionaries
+_IMMUTABLE_TYPES = frozenset(
+    {str, int, float, bool, type(None), bytes, UUID, date, datetime, time}
+)
+
+
+def _normalize_value(value: Any) -> Any:
+    if TYPES_HANDLERS == _default_types_handlers:
+        value_type = type(value)
+
+        if value_type in _PLAIN_TYPES:
+            return value
+
+        converter = _BUILTIN_CONVERTERS.get(value_type)
+        if converter is not None:
+            return converter(value)
+
+        if isinstance(value, Enum):
+            _BUILTIN_CONVERTERS[value_type] = _enum_value
+            return _enum_value(value)
+
+    for handler in TYPES_HANDLERS:
+        value = handler.normalize(value)
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _normalize_str_key(key: str) -> str:
+    # "_" is not a cased character, so title-casing the whole tail capitalizes each
+    # of its words like title-casing them one by one, without intermediate lists
+    first, _, others = key.rstrip("_").partition("_")
+    return first.lower() + others.title().replace("_", "")
+
 
 def normalize_key(key: Any) -> str:
     if isinstance(key, Enum):
         return key.value
     if not isinstance(key, str):
         return key
-    first, *others = key.rstrip("_").split("_")
-    return "".join([first.lower(), *map(str.title, others)])
+    # the set of property names is small and reused across all instances, so the
+    # conversion to camelCase is computed once per distinct key
+    return _normalize_str_key(key)
+
+
+def _lookup_methods(obj: Any) -> Tuple[bool, bool, bool]:
+    """
+    Returns a tuple of booleans telling whether the given object has a `to_obj`,
+    a `model_dump` (Pydantic 2), and a `dict` (Pydantic 1) method.
+    """
+    return (
+        hasattr(obj, "to_obj"),
+        callable(getattr(obj, "model_dump", None)),
+        callable(getattr(obj, "dict", None)),
+    )
+
+
+# checking the type once is cheaper than calling `hasattr` on each value
+_get_type_methods = lru_cache(maxsize=1024)(_lookup_methods)
+
+
+def _get_methods(obj: Any) -> Tuple[bool, bool, bool]:
+    """
+    Returns the methods of the given object like `_lookup_methods`, looking them up
+    on its type, which is cached. The object itself is checked only if its type has
+    none of them, to support objects that get them per instance (e.g. through
+    `__getattr__`).
+    """
+    obj_type = type(obj)
+    methods = _get_type_methods(obj_type)
+
+    if not any(methods) and obj_type not in _IMMUTABLE_TYPES:
+        return _lookup_methods(obj)
+    return methods
 
 
 def normalize_dict_factory(items: List[Tuple[Any, Any]]) -> Any:
@@ -73,59 +181,244 @@ def normalize_dict_factory(items: List[Tuple[Any, Any]]) -> Any:
         if value is None:
             continue
 
-        if hasattr(value, "to_obj"):
+        has_to_obj, _, _ = _get_methods(value)
+
+        if has_to_obj:
             value = value.to_obj()
 
         if key == "ref":
             data["$ref"] = value
             continue
 
-        for handler in TYPES_HANDLERS:
-            value = handler.normalize(value)
-
-        data[normalize_key(key)] = value
+        data[normalize_key(key)] = _normalize_value(value)
     return data
 
 
 def regular_dict_factory(items: List[Tuple[Any, Any]]) -> Any:
     data = {}
     for key, value in items:
-        for handler in TYPES_HANDLERS:
-            value = handler.normalize(value)
-
-        data[key] = value
+        data[key] = _normalize_value(value)
     return data
 
 
+def _element_key(name: str) -> str:
+    return "$ref" if name == "ref" else normalize_key(name)
+
+
+# code converting a field of an OpenAPIElement: scalar values and values of types
+# having a converter (which are leaves of the document, like enum members) are
+# handled inline, other values are converted by _asdict_inner
+_ELEMENT_FIELD_TEMPLATE = """
+    value = obj.{name}
+    if value is not None:
+        value_type = type(value)
+        if value_type in _SCALAR_TYPES:
+            data[{key}] = value
+        else:
+            converter = _BUILTIN_CONVERTERS.get(value_type)
+            if converter is not None:
+                data[{key}] = converter(value)
+            else:
+                value = _asdict_inner(value, normalize_dict_factory)
+                if value is not None:
+                    data[{key}] = _normalize_value(value)"""
+
+
+@lru_cache(maxsize=None)
+def _element_asdict_function(cls) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Returns a function that creates a dictionary representing an instance of the
+    given OpenAPIElement class, like `_asdict_inner` with `normalize_dict_factory`.
+
+    The function is generated once per class, with the attributes of the class and
+    their normalized keys written in its code, like dataclasses generate __init__:
+    None values, that are most values in OpenAPI Documentation, are skipped without
+    iterating over fields and calling getters. When TYPES_HANDLERS is customized, the
+    function converts all fields with `_fields_asdict` instead.
+    """
+    lines = [
+        "def element_asdict(obj):",
+        "    if not _uses_default_types_handlers():",
+        "        return _fields_asdict(obj, normalize_dict_factory)",
+        "    data = {}",
+    ]
+    for field in fields(cls):
+        lines.append(
+            _ELEMENT_FIELD_TEMPLATE.format(
+                name=field.name, key=repr(_element_key(field.name))
+            )
+        )
+    lines.append("    return data")
+
+    namespace: Dict[str, Any] = {}
+    exec(
+        "\n".join(lines),
+        {
+            "_asdict_inner": _asdict_inner,
+            "_fields_asdict": _fields_asdict,
+            "_uses_default_types_handlers": _uses_default_types_handlers,
+            "normalize_dict_factory": normalize_dict_factory,
+            "_normalize_value": _normalize_value,
+            "_SCALAR_TYPES": _SCALAR_TYPES,
+            "_BUILTIN_CONVERTERS": _BUILTIN_CONVERTERS,
+        },
+        namespace,
+    )
+    return namespace["element_asdict"]
+
+
+def _fields_asdict(obj, dict_factory):
+    result = []
+    for f in fields(obj):
+        value = _asdict_inner(getattr(obj, f.name), dict_factory)
+        result.append((f.name, value))
+    return dict_factory(result)
+
+
+def _list_asdict(obj, dict_factory):
+    return [_asdict_inner(v, dict_factory) for v in obj]
+
+
+def _tuple_asdict(obj, dict_factory):
+    return tuple([_asdict_inner(v, dict_factory) for v in obj])
+
+
+def _dict_asdict(obj, dict_factory):
+    result = {}
+    for key, value in obj.items():
+        # keys are nearly always strings (e.g. names of properties and schemas)
+        if type(key) not in _IMMUTABLE_TYPES:
+            key = _asdict_inner(key, dict_factory)
+        result[key] = _asdict_inner(value, dict_factory)
+    return result
+
+
+def _sequence_asdict(obj, dict_factory):
+    return type(obj)(_asdict_inner(v, dict_factory) for v in obj)
+
+
+def _mapping_asdict(obj, dict_factory):
+    return type(obj)(
+        (_asdict_inner(k, dict_factory), _asdict_inner(v, dict_factory))
+        for k, v in obj.items()
+    )
+
+
+# handlers for the built-in containers, looked up by exact type; subclasses are
+# handled by _sequence_asdict and _mapping_asdict, to preserve their type
+_CONTAINERS_HANDLERS: Dict[type, Callable[[Any, Callable], Any]] = {
+    list: _list_asdict,
+    tuple: _tuple_asdict,
+    dict: _dict_asdict,
+}
+
+
+# functions converting OpenAPI elements with normalize_dict_factory, looked up by
+# exact type to skip the checks of _asdict_inner; types are added when first converted
+_ELEMENTS_CONVERTERS: Dict[type, Callable[[Any], Any]] = {}
+
+
 # replicates the asdict method from dataclasses module, to support
 # bypassing "asdict" on child properties when they implement a `to_obj`
 # method: some entities require a specific shape when represented
 def _asdict_inner(obj, dict_factory):
-    if hasattr(obj, "to_obj"):
+    obj_type = type(obj)
+
+    if obj_type in _IMMUTABLE_TYPES:
+        # most leaves in a document are strings: skip all other checks for them
+        return obj
+
+    container_handler = _CONTAINERS_HANDLERS.get(obj_type)
+    if container_handler is not None:
+        return container_handler(obj, dict_factory)
+
+    if dict_factory is normalize_dict_factory:
+        converter = _ELEMENTS_CONVERTERS.get(obj_type)
+        if converter is not None:
+            return converter(obj)
+
+    has_to_obj, has_model_dump, has_dict = _get_methods(obj)
+
+    if has_to_obj:
+        if isinstance(obj, OpenAPIElement) and _get_type_methods(obj_type)[0]:
+            _ELEMENTS_CONVERTERS[obj_type] = obj_type.to_obj
         return obj.to_obj()
     if isinstance(obj, OpenAPIElement):
-        result = []
-        for f in fields(obj):
-            value = _asdict_inner(getattr(obj, f.name), dict_factory)
-            result.append((f.name, value))
-        return dict_factory(result)
-    if hasattr(obj, "model_dump") and callable(obj.model_dump):
+        if dict_factory is normalize_dict_factory:
+            converter = _element_asdict_function(obj_type)
+            _ELEMENTS_CONVERTERS[obj_type] = converter
+            return converter(obj)
+        return _fields_asdict(obj, dict_factory)
+    if has_model_dump:
         # For Pydantic 2
         return obj.model_dump()
-    if hasattr(obj, "dict") and callable(obj.dict):
+    if has_dict:
         # For Pydantic 1
         return obj.dict()
     if is_dataclass(obj):
         return asdict(obj, dict_factory=regular_dict_factory)
     elif isinstance(obj, (list, tuple)):
-        return type(obj)(_asdict_inner(v, dict_factory) for v in obj)
+        return _sequence_asdict(obj, dict_factory)
     elif isinstance(obj, dict):
-        return type(obj)(
-            (_asdict_inner(k, dict_factory), _asdict_inner(v, dict_factory))
-            for k, v in obj.items()
-        )
+        return _mapping_asdict(obj, dict_factory)
+    elif isinstance(obj, (set, frozenset)):
+        return [_asdict_inner(v, dict_factory) for v in obj]
     else:
-        return copy.deepcopy(obj)
+        # the result is only used to produce a serialized representation, so there
+        # is no need to copy values
+        return obj
+
+
+def _iter_children(obj: Any) -> Iterator[Tuple[str, Any]]:
+    """
+    Yields the values contained in the given object, with the Python expressions
+    that read them from the object.
+    """
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield f"[{key!r}]", value
+    elif isinstance(obj, (list, tuple)):
+        for index, value in enumerate(obj):
+            yield f"[{index}]", value
+    elif is_dataclass(obj) and not isinstance(obj, type):
+        for f in fields(obj):
+            yield f".{f.name}", getattr(obj, f.name)
+
+
+def _find_cycle(obj: Any) -> Optional[Tuple[str, str]]:
+    """
+    Returns the paths of the first object found containing itself in the given
+    object, at its position in the cycle and at its first position, or None if the
+    given object contains no cycles. Objects are walked using a stack instead of
+    recursion, so that they can be walked even if they are nested too deeply to be
+    converted.
+    """
+    labels = [type(obj).__name__]
+    # ids of the objects in the path being walked, with the length of their path
+    path = {id(obj): 1}
+    visited = set()
+    stack = [(id(obj), _iter_children(obj))]
+
+    while stack:
+        obj_id, children = stack[-1]
+
+        for label, child in children:
+            if type(child) in _IMMUTABLE_TYPES:
+                continue
+            child_id = id(child)
+            if child_id in path:
+                return "".join(labels) + label, "".join(labels[: path[child_id]])
+            if child_id not in visited:
+                labels.append(label)
+                path[child_id] = len(labels)
+                stack.append((child_id, _iter_children(child)))
+                break
+        else:
+            stack.pop()
+            labels.pop()
+            del path[obj_id]
+            visited.add(obj_id)
+    return None
 
 
 def normalize_dict(obj):
@@ -134,7 +427,19 @@ def normalize_dict(obj):
     if hasattr(obj, "to_obj"):
         return obj.to_obj()
     if isinstance(obj, OpenAPIElement):
-        return _asdict_inner(obj, dict_factory=normalize_dict_factory)
+        try:
+            return _asdict_inner(obj, dict_factory=normalize_dict_factory)
+        except RecursionError as recursion_error:
+            # checking for cycles at each node would slow down serialization, so the
+            # object is searched for cycles only when it could not be converted
+            cycle = _find_cycle(obj)
+            if cycle is None:
+                # the object is nested too deeply
+                raise
+            raise ValueError(
+                f"The object contains a reference cycle: {cycle[0]} is "
+                f"{cycle[1]}. Use Reference objects to describe recursive schemas."
+            ) from recursion_error
     return asdict(obj, dict_factory=regular_dict_factory)
 
 
@@ -155,11 +460,15 @@ class Serializer:
         return self._get_item_dictionary(item)
 
     def to_json(self, item: Any) -> str:
-        return dumps(self.to_obj(item), indent=4, cls=OADJSONEncoder)
+        return write_json(self.to_obj(item))
 
     def to_yaml(self, item: Any) -> str:
         rep = yaml.dump(
-            self.to_obj(item), sort_keys=False, indent=4, allow_unicode=True
+            self.to_obj(item),
+            Dumper=YAMLDumper,
+            sort_keys=False,
+            indent=4,
+            allow_unicode=True,
         )
         assert isinstance(rep, str)
         return rep
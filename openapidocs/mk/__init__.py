@@ -3,11 +3,15 @@ This module provides common functions to generate other kinds of representations
 source OpenAPI Documentation files.
 """
 import re
+from functools import lru_cache
 from http import HTTPStatus
 
 import markupsafe
 
+_route_param_pattern = re.compile(r"\{[^\}]+\}")
 
+
+@lru_cache(maxsize=128)
 def get_http_status_phrase(status_code) -> str:
     try:
         http_status = HTTPStatus(int(status_code))
@@ -26,32 +30,77 @@ def read_dict(obj, *args, default=None):
     assert isinstance(obj, dict)
 
     value = obj
-    for key in args:
-        if not isinstance(value, dict):
-            raise ValueError(f"Invalid sub-path: {repr(args)}")
-
-        value = value.get(key)
+    try:
+        for key in args:
+            value = value.get(key)
 
-        if value is None:
-            return default
+            if value is None:
+                return default
+    except AttributeError:
+        # a value in the path is not a dictionary
+        raise ValueError(f"Invalid sub-path: {repr(args)}")
 
-    if value is None or value is obj:
+    if value is obj:
         return default
 
     return value
 
 
+def read_dict2(obj, key_one, key_two, default=None):
+    """
+    Reads a property of a child dictionary in a source dictionary, returning the
+    default value if any is missing. This is equivalent to read_dict with two keys,
+    which is the most common case in templates.
+
+    Example:
+    read_dict2({"a": {"b": True}}, "a", "b") --> True
+    """
+    value = obj.get(key_one)
+
+    if value is None:
+        return default
+
+    if not isinstance(value, dict):
+        raise ValueError(f"Invalid sub-path: {repr((key_one, key_two))}")
+
+    value = value.get(key_two)
+    return default if value is None else value
+
+
+def read_dict3(obj, key_one, key_two, key_three, default=None):
+    """
+    Equivalent to read_dict with three keys.
+
+    Example:
+    read_dict3({"a": {"b": {"c": True}}}, "a", "b", "c") --> True
+    """
+    value = obj.get(key_one)
+
+    if value is None:
+        return default
+
+    if not isinstance(value, dict):
+        raise ValueError(f"Invalid sub-path: {repr((key_one, key_two, key_three))}")
+
+    return read_dict2(value, key_two, key_three, default=default)
+
+
+def _item_sort_key(item):
+    key = item[0]
+    return key.lower() if isinstance(key, str) else key
+
+
 def sort_dict(obj):
     """
-    Yields (key, value) of a dictionary with keys in alphabetical order.
+    Returns a list of (key, value) of a dictionary with keys in alphabetical order.
     """
-    for key in sorted(obj, key=str.lower):
-        yield key, obj[key]
+    return sorted(obj.items(), key=_item_sort_key)
 
 
-def highlight_params(path: str) -> str:
-    def replacer(match):
-        value = match.group()
-        return f'<span class="route-param">{markupsafe.escape(value)}</span>'
+def _route_param_replacer(match: "re.Match[str]") -> str:
+    value = match.group()
+    return f'<span class="route-param">{markupsafe.escape(value)}</span>'
+
 
-    return re.sub(r"\{[^\}]+\}", replacer, path)
+def highlight_params(path: str) -> str:
+    return _route_param_pattern.sub(_route_param_replacer, path)
@@ -5,6 +5,8 @@ from source OAD files.
 """
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import TextIO
 
 
 class DocumentsWriter(ABC):
@@ -19,6 +21,12 @@ class DocumentsWriter(ABC):
         Writes markdown.
         """
 
+    def write_to(self, data, output: TextIO, **kwargs) -> None:
+        """
+        Writes markdown to the given text stream.
+        """
+        output.write(self.write(data, **kwargs))
+
 
 def is_reference(data) -> bool:
     """
@@ -64,4 +72,9 @@ def get_ref_type_name(reference) -> str:
     """
     if isinstance(reference, dict):
         reference = reference["$ref"]
+    return _get_ref_type_name(reference)
+
+
+@lru_cache(maxsize=4096)
+def _get_ref_type_name(reference: str) -> str:
     return reference.lstrip("#/").split("/")[-1]
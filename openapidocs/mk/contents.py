@@ -1,27 +1,139 @@
 """
 This module contains classes to generate representations of content types by mime type.
 """
+import base64
+import json
 import os
+import re
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import date, datetime, time
+from enum import Enum
 from json import JSONEncoder
+from typing import Any, Callable, Dict
 from urllib.parse import urlencode
+from uuid import UUID
 
-from essentials.json import FriendlyEncoder, dumps
+from essentials.json import FriendlyEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _encode_datetime(value: datetime) -> str:
+    # the environment variable is read each time, to support changing it at runtime
+    datetime_format = os.environ.get("OPENAPI_DATETIME_FORMAT")
+    if datetime_format:
+        return value.strftime(datetime_format)
+    return value.isoformat()
+
+
+_friendly_encoder = FriendlyEncoder()
+
+# converters for built-in types that JSON does not support, looked up by exact type;
+# openapidocs.common uses the same converters to normalize values
+BUILTIN_TYPES_CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    UUID: str,
+    time: lambda value: value.strftime("%H:%M:%S"),
+    datetime: datetime.isoformat,
+    date: lambda value: value.strftime("%Y-%m-%d"),
+    bytes: lambda value: base64.urlsafe_b64encode(value).decode("utf8"),
+}
+
+# JSON documents support a custom format for datetimes
+_encoders: Dict[type, Callable[[Any], Any]] = {
+    **BUILTIN_TYPES_CONVERTERS,
+    datetime: _encode_datetime,
+}
+
+
+def json_default(obj: Any) -> Any:
+    """
+    Returns a JSON serializable representation of objects that are not supported
+    natively by JSON encoders, raising TypeError for unsupported objects.
+    """
+    encoder = _encoders.get(type(obj))
+    if encoder is not None:
+        return encoder(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return _encode_datetime(obj)
+    return _friendly_encoder.default(obj)
 
 
 class OADJSONEncoder(JSONEncoder):
     def default(self, obj):
+        return json_default(obj)
+
+
+_leading_spaces = re.compile(r"^ +", re.MULTILINE)
+
+
+def _double_indent(match: "re.Match[str]") -> str:
+    return match.group() * 2
+
+
+# types of values that orjson writes like the json module of the standard library,
+# or that it passes to json_default
+_orjson_safe_types = frozenset({str, int, bool, type(None), *_encoders})
+
+
+def _orjson_compatible(value: Any) -> bool:
+    """
+    Returns a value indicating whether orjson writes the given value like the json
+    module of the standard library. orjson writes NaN and Infinity as null, and
+    formats floats using exponents differently (e.g. 1e16 rather than 1e+16), so
+    values containing such floats, or objects of other types, are not compatible.
+    """
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        item_type = type(item)
+
+        if item_type in _orjson_safe_types:
+            continue
+        if item_type is dict:
+            stack.extend(item.values())
+        elif item_type is list or item_type is tuple:
+            stack.extend(item)
+        elif item_type is float:
+            # the json module uses exponents for values outside this range, and
+            # the comparison is False for NaN
+            if item != 0 and not 1e-4 <= abs(item) < 1e16:
+                return False
+        else:
+            return False
+    return True
+
+
+def write_json(value: Any) -> str:
+    """
+    Returns a JSON representation of the given value, indented with four spaces.
+
+    orjson is used when installed, since it is much faster than the json module of the
+    standard library on large documents, unless the value contains floats or objects
+    that orjson would write differently. orjson only supports an indentation of two
+    spaces, so the leading whitespace of each line is doubled: this is safe because
+    line breaks inside JSON strings are always escaped. orjson only accepts keys of
+    type str: dictionaries having other keys are written by the json module.
+    """
+    if orjson is not None and _orjson_compatible(value):
         try:
-            return JSONEncoder.default(self, obj)
-        except TypeError:
-            if isinstance(obj, datetime):
-                datetime_format = os.environ.get("OPENAPI_DATETIME_FORMAT")
-                if datetime_format:
-                    return obj.strftime(datetime_format)
-                else:
-                    return obj.isoformat()
-            return FriendlyEncoder.default(self, obj)  # type: ignore
+            data = orjson.dumps(
+                value,
+                default=json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            # for example, keys that are not strings, integers bigger than 64 bits
+            # or very deep nesting: fall back to the json module of the standard
+            # library
+            pass
+        else:
+            return _leading_spaces.sub(_double_indent, data.decode("utf8"))
+    return json.dumps(value, indent=4, ensure_ascii=False, default=json_default)
 
 
 class ContentWriter(ABC):
@@ -48,7 +160,7 @@ class JSONContentWriter(ContentWriter):
         return "json" in content_type.lower()
 
     def write(self, value) -> str:
-        return dumps(value, indent=4, cls=OADJSONEncoder)
+        return write_json(value)
 
 
 class FormContentWriter(ContentWriter):
@@ -3,10 +3,18 @@ This module provides a Jinja2 environment.
 """
 import os
 from enum import Enum
+from typing import TextIO
 
 from jinja2 import Environment, PackageLoader, Template, select_autoescape
 
-from . import get_http_status_phrase, highlight_params, read_dict, sort_dict
+from . import (
+    get_http_status_phrase,
+    highlight_params,
+    read_dict,
+    read_dict2,
+    read_dict3,
+    sort_dict,
+)
 from .common import DocumentsWriter, is_reference
 from .md import normalize_link, write_table
 
@@ -20,6 +28,8 @@ def configure_filters(env: Environment):
 def configure_functions(env: Environment):
     helpers = {
         "read_dict": read_dict,
+        "read_dict2": read_dict2,
+        "read_dict3": read_dict3,
         "sort_dict": sort_dict,
         "is_reference": is_reference,
         "scalar_types": {"string", "integer", "boolean", "number"},
@@ -78,7 +88,10 @@ def get_environment(
             autoescape=select_autoescape(["html", "xml"])
             if os.environ.get("SELECT_AUTOESCAPE") in {"YES", "Y", "1"}
             else False,
-            auto_reload=True,
+            # templates are bundled with the package and don't change at runtime:
+            # skip checking their files for changes, and keep all of them compiled
+            auto_reload=False,
+            cache_size=-1,
             enable_async=False,
         )
         configure_filters(env)
@@ -99,14 +112,20 @@ class Jinja2DocumentsWriter(DocumentsWriter):
         views_style: OutputStyle = OutputStyle.MKDOCS,
     ) -> None:
         self._env = get_environment(package_name, views_style)
+        self._template = self._env.get_template("layout.html")
 
     @property
     def env(self) -> Environment:
         return self._env
 
     def get_template(self) -> Template:
-        return self.env.get_template("layout.html")
+        return self._template
 
     def write(self, data, **kwargs) -> str:
         template = self.get_template()
         return template.render(data, **kwargs)
+
+    def write_to(self, data, output: TextIO, **kwargs) -> None:
+        # stream the rendered chunks, to not keep the whole output in memory
+        template = self.get_template()
+        template.stream(data, **kwargs).dump(output)
@@ -2,26 +2,21 @@
 This module provides common functions to handle Markdown.
 These functions apply to any kind of Markdown work.
 """
-from typing import Dict, Iterable
+from typing import Iterable, List
 
 
-def write_row(
-    row: Iterable[str],
-    columns_widths: Dict[int, int],
-    padding: int = 1,
-    indent: int = 0,
-) -> str:
+def _get_row_format(columns_widths: List[int], padding: int, indent: int) -> str:
     """
-    Writes a single row for a Markdown table.
+    Returns a format string to write the rows of a Markdown table having the given
+    columns widths, so that each row is written with a single call to `str.format`.
     """
-    indent_chars = " " * indent
     pad_chars = " " * padding
     return (
-        indent_chars
+        " " * indent
         + "|"
         + "|".join(
-            pad_chars + str(cell_value).ljust(columns_widths[i]) + pad_chars
-            for i, cell_value in enumerate(row)
+            f"{pad_chars}{{:<{column_width}}}{pad_chars}"
+            for column_width in columns_widths
         )
         + "|"
     )
@@ -36,22 +31,23 @@ def write_table_lines(
     """
     Writes the lines of a Markdown table from a matrix (iterable of string records).
     """
-    # TODO: assert that all rows have the same number of cells
-    columns_widths = {
-        i: max(len(str(value)) for value in column)
-        for i, column in enumerate(zip(*matrix))
-    }
+    # the matrix is read only once, so it can also be a generator
+    rows = [[str(value) for value in row] for row in matrix]
+
+    # zip would silently drop the cells of rows longer than the shortest one
+    if rows and any(len(row) != len(rows[0]) for row in rows):
+        raise ValueError("All rows of a table must have the same number of cells")
 
-    for row in matrix:
-        yield write_row(row, columns_widths, padding, indent)
+    columns_widths = [max(map(len, column)) for column in zip(*rows)]
+    row_format = _get_row_format(columns_widths, padding, indent)
+
+    for row in rows:
+        yield row_format.format(*row)
 
         if write_headers:
             # add separator line after headers
-            yield write_row(
-                ["-" * column_len for column_len in columns_widths.values()],
-                columns_widths,
-                padding,
-                indent,
+            yield row_format.format(
+                *["-" * column_len for column_len in columns_widths]
             )
 
             write_headers = False
@@ -68,7 +64,11 @@ def write_table(
     return "\n".join((write_table_lines(matrix, write_headers, padding)))
 
 
+# characters removed from values used in links anchors
+_link_translation = str.maketrans("", "", ".")
+
+
 def normalize_link(value: str) -> str:
     if not value:
         raise ValueError("Missing value")
-    return value.replace(".", "")
+    return value.translate(_link_translation)
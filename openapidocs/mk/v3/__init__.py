@@ -1,16 +1,16 @@
 """
 This module provides functions to generate Markdown for OpenAPI Version 3.
 """
-import copy
 import os
+import sys
 import warnings
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO, Tuple, Union
 
 from openapidocs.logs import logger
-from openapidocs.mk import read_dict, sort_dict
+from openapidocs.mk import read_dict, read_dict2, sort_dict
 from openapidocs.mk.common import (
     DocumentsWriter,
     get_ref_type_name,
@@ -22,7 +22,7 @@ from openapidocs.mk.contents import ContentWriter, FormContentWriter, JSONConten
 from openapidocs.mk.jinja import Jinja2DocumentsWriter, OutputStyle
 from openapidocs.mk.texts import EnglishTexts, Texts
 from openapidocs.mk.v3.examples import get_example_from_schema
-from openapidocs.utils.source import read_from_source
+from openapidocs.utils.source import _read_from_source_cached
 
 
 def _can_simplify_json(content_type) -> bool:
@@ -33,9 +33,16 @@ def _can_simplify_xml(content_type) -> bool:
     return "xml" in content_type
 
 
+# properties whose values are repeated across the document and used as keys to look up
+# dictionaries and sets, like the caches of resolved references
+_interned_values_keys = frozenset({"$ref", "type", "format", "in"})
+
+
 class ExpandContext:
+    __slots__ = ("expanded_refs",)
+
     def __init__(self) -> None:
-        self.expanded_refs = set()
+        self.expanded_refs: Set[str] = set()
 
 
 @dataclass
@@ -54,6 +61,21 @@ def style_from_value(value: Union[int, str]) -> OutputStyle:
         raise ValueError(f"Invalid style: {value}")
 
 
+# Jinja2 writers are stateless once their templates are compiled: they are shared by
+# all handlers using the same output style, to compile templates only once
+_writers_cache: Dict[OutputStyle, Jinja2DocumentsWriter] = {}
+
+
+def _get_default_writer(style: OutputStyle) -> Jinja2DocumentsWriter:
+    try:
+        return _writers_cache[style]
+    except KeyError:
+        writer = _writers_cache[style] = Jinja2DocumentsWriter(
+            __name__, views_style=style
+        )
+        return writer
+
+
 class OpenAPIDocumentationHandlerError(Exception):
     """Base type for exceptions raised by the handler generating documentation."""
 
@@ -98,10 +120,19 @@ class OpenAPIV3DocumentationHandler:
     ) -> None:
         self._source = source
         self.texts = texts or EnglishTexts()
-        self._writer = writer or Jinja2DocumentsWriter(
-            __name__, views_style=style_from_value(style)
-        )
-        self.doc = self.normalize_data(copy.deepcopy(doc))
+        self._files_cache: Dict[str, Any] = {}
+        self._writer = writer or _get_default_writer(style_from_value(style))
+        self.doc = self.normalize_data(doc)
+        self._references_cache: Dict[str, Any] = {}
+        self._expanded_schemas: Dict[int, Tuple[Any, Any]] = {}
+        self._has_references_cache: Dict[int, Tuple[Any, bool]] = {}
+        self._parameters_cache: Dict[int, Tuple[Any, List[dict]]] = {}
+        self._properties_cache: Dict[int, Tuple[Any, List[List[Any]]]] = {}
+        self._examples_cache: Dict[int, Tuple[Any, Any]] = {}
+        self._operations: Optional[Dict[str, List[Tuple[str, Any]]]] = None
+        self._schemas: Optional[List[Tuple[str, Any]]] = None
+        self._security_schemes = read_dict2(self.doc, "components", "securitySchemes")
+        self._resolve_operations_references()
 
     @property
     def source(self) -> str:
@@ -121,83 +152,130 @@ class OpenAPIV3DocumentationHandler:
         $ref fields MUST be used in the specification to reference those parts as
         follows from the JSON Schema definitions.
         """
+        data = self._transform_data(
+            data, Path(self.source).parent if self.source else Path.cwd()
+        )
+
         if "components" not in data:
             data["components"] = {}
 
-        return self._transform_data(
-            data, Path(self.source).parent if self.source else Path.cwd()
-        )
+        return data
 
     def _transform_data(self, obj, source_path):
+        """
+        Returns a copy of the given object, in which references to other files are
+        resolved. The document is copied only once, while it is visited, so that the
+        source document is never modified, and string keys are interned: the same few
+        keys ("type", "properties", "$ref", etc.) are repeated for every node, and once
+        interned they are the same objects used as string literals in code, which
+        makes dictionary lookups cheaper.
+        """
+        if isinstance(obj, list):
+            return [self._transform_data(item, source_path) for item in obj]
+
         if not isinstance(obj, dict):
             return obj
 
-        if "$ref" in obj:
-            return self._handle_obj_ref(obj, source_path)
+        reference = obj.get("$ref")
+
+        if isinstance(reference, str) and not reference.startswith("#/"):
+            # reference to another file: this is used to read specification files
+            # when they are split into multiple items
+            referred_path = os.path.abspath(source_path / reference)
+
+            # the same files are often referenced from many places: each is read
+            # and transformed only once
+            try:
+                return self._files_cache[referred_path]
+            except KeyError:
+                pass
+
+            referred_file = Path(referred_path)
+
+            if referred_file.exists():
+                logger.debug("Handling $ref source: %s", reference)
+            else:
+                raise OpenAPIFileNotFoundError(reference, referred_file)
+            sub_fragment = self._transform_data(
+                _read_from_source_cached(referred_path), referred_file.parent
+            )
+            self._files_cache[referred_path] = sub_fragment
+            return sub_fragment
 
         clone = {}
 
         for key, value in obj.items():
-            if isinstance(value, list):
-                clone[key] = [self._transform_data(item, source_path) for item in value]
-            elif isinstance(value, dict):
-                clone[key] = self._handle_obj_ref(value, source_path)
-            else:
-                clone[key] = self._transform_data(value, source_path)
+            if type(key) is str:
+                key = sys.intern(key)
 
-        return clone
+                if key in _interned_values_keys and type(value) is str:
+                    clone[key] = sys.intern(value)
+                    continue
 
-    def _handle_obj_ref(self, obj, source_path):
-        """
-        Handles a dictionary containing a $ref property, resolving the reference if it
-        is to a file. This is used to read specification files when they are split into
-        multiple items.
-        """
-        assert isinstance(obj, dict)
-        if "$ref" in obj:
-            reference = obj["$ref"]
-            if isinstance(reference, str) and not reference.startswith("#/"):
-                referred_file = Path(os.path.abspath(source_path / reference))
+            clone[key] = self._transform_data(value, source_path)
 
-                if referred_file.exists():
-                    logger.debug("Handling $ref source: %s", reference)
-                else:
-                    raise OpenAPIFileNotFoundError(reference, referred_file)
-                sub_fragment = read_from_source(str(referred_file))
-                return self._transform_data(sub_fragment, referred_file.parent)
-            else:
-                return obj
-        return self._transform_data(obj, source_path)
+        return clone
 
     def get_operations(self):
         """
         Gets a dictionary of operations grouped by tag.
         """
+        # the document is not modified after normalization, so operations are
+        # grouped only once, even if templates request them more than once
+        if self._operations is None:
+            self._operations = self._get_operations()
+        return self._operations
+
+    def _get_operations(self):
         data = self.doc
         groups = defaultdict(list)
         paths = data["paths"]
 
         for path, path_item in paths.items():
             tag = self.get_tag(path_item) or ""
+            groups[tag].append((path, path_item))
+
+        return groups
+
+    def _resolve_operations_references(self) -> None:
+        """
+        Replaces references to request bodies and parameters in operations with the
+        objects they refer to, once for the whole document, so that templates can
+        use them directly. Resolved objects are shared, and must not be modified.
+        """
+        paths = self.doc.get("paths")
+
+        if not isinstance(paths, dict):
+            return
+
+        for path_item in paths.values():
+            if not isinstance(path_item, dict):
+                continue
 
             for operation in path_item.values():
-                # need to resolve possible references for requestBody
+                if not isinstance(operation, dict):
+                    continue
+
                 if "requestBody" in operation:
                     operation["requestBody"] = self._resolve_opt_ref(
                         operation["requestBody"]
                     )
 
-            groups[tag].append((path, path_item))
-
-        return groups
+                parameters = operation.get("parameters")
 
-    def get_schemas(self):
-        schemas = read_dict(self.doc, "components", "schemas")
-
-        if not schemas:
-            return
+                if parameters:
+                    operation["parameters"] = [
+                        self._resolve_opt_ref(item) for item in parameters
+                    ]
 
-        yield from sort_dict(schemas)
+    def get_schemas(self) -> List[Tuple[str, Any]]:
+        """
+        Gets the list of components schemas, sorted by name.
+        """
+        if self._schemas is None:
+            schemas = read_dict2(self.doc, "components", "schemas")
+            self._schemas = sort_dict(schemas) if schemas else []
+        return self._schemas
 
     def get_tag(self, path_item) -> Optional[str]:
         """
@@ -211,9 +289,11 @@ class OpenAPIV3DocumentationHandler:
             "post": {..., "tags": ["Albums"]}
         }
 
-        Tags are optional.
+        Tags are optional. If operations have more than one tag in common, the first
+        one is used, following the order of the tags of the first tagged operation.
         """
-        single_tag: Optional[str] = None
+        first_tags: Optional[List[str]] = None
+        common_tags: Set[str] = set()
 
         for operation in path_item.values():
             tags = operation.get("tags")
@@ -221,12 +301,19 @@ class OpenAPIV3DocumentationHandler:
             if not tags:
                 continue
 
-            single_tag = next(
-                (item for item in tags if single_tag is None or item == single_tag),
-                None,
-            )
+            if first_tags is None:
+                first_tags = tags
+                common_tags = set(tags)
+            else:
+                common_tags.intersection_update(tags)
+
+            if not common_tags:
+                return None
 
-        return single_tag
+        if first_tags is None:
+            return None
+
+        return next(tag for tag in first_tags if tag in common_tags)
 
     def simplify_content(self, content):
         """
@@ -265,7 +352,9 @@ class OpenAPIV3DocumentationHandler:
             }
         }
         """
-        simplified_content = copy.deepcopy(content)
+        # only the top level dictionary and the main declarations are modified,
+        # so a shallow copy is sufficient
+        simplified_content = dict(content)
         all_types = simplified_content.keys()
 
         for content_type, predicate in self.simplifiable_types.items():
@@ -287,7 +376,9 @@ class OpenAPIV3DocumentationHandler:
                     alt_types = list(types_to_remove)
                     # sort to use alphabetically sorted values
                     alt_types.sort()
+                    main_declaration = dict(main_declaration)
                     main_declaration["alt_types"] = alt_types
+                    simplified_content[content_type] = main_declaration
 
         return simplified_content
 
@@ -295,7 +386,7 @@ class OpenAPIV3DocumentationHandler:
         """
         Gets a security scheme from the components section, by name.
         """
-        security_scheme = read_dict(self.doc, "components", "securitySchemes")
+        security_scheme = self._security_schemes
 
         if not security_scheme:  # pragma: no cover
             warnings.warn(
@@ -379,7 +470,7 @@ class OpenAPIV3DocumentationHandler:
         return None
 
     def _resolve_opt_ref(self, obj):
-        if "$ref" in obj:
+        if is_reference(obj):
             return self.resolve_reference(obj)
         return obj
 
@@ -389,6 +480,18 @@ class OpenAPIV3DocumentationHandler:
         References to #/components/parameters are resolved, to show the information in
         a single place.
         """
+        # templates can request the parameters of an operation more than once
+        cached = self._parameters_cache.get(id(operation))
+        if cached is not None and cached[0] is operation:
+            return cached[1]
+
+        results = self._get_parameters(operation)
+        self._parameters_cache[id(operation)] = (operation, results)
+        return results
+
+    def _get_parameters(self, operation) -> List[dict]:
+        # references are already resolved for operations of the document, this is
+        # for operations from other sources
         parameters = [
             self._resolve_opt_ref(item) for item in operation.get("parameters", [])
         ]
@@ -421,14 +524,23 @@ class OpenAPIV3DocumentationHandler:
 
         return results
 
-    def write(self) -> str:
-        return self._writer.write(
-            self.doc,
+    def _get_writer_context(self):
+        return dict(
             operations=self.get_operations(),
             texts=self.texts,
             handler=self,
         )
 
+    def write(self) -> str:
+        return self._writer.write(self.doc, **self._get_writer_context())
+
+    def write_to(self, output: TextIO) -> None:
+        """
+        Writes the documentation to the given text stream, for example a file opened
+        for writing, without building the whole output in memory first.
+        """
+        self._writer.write_to(self.doc, output, **self._get_writer_context())
+
     def get_content_examples(self, data) -> Iterable[ContentExample]:
         """
         Returns examples to show an example for a content definition.
@@ -495,8 +607,6 @@ class OpenAPIV3DocumentationHandler:
         if example:
             yield ContentExample(example, auto_generated)
 
-        return ""
-
     def write_content_example(self, example: ContentExample, content_type: str) -> str:
         example_handler = self.get_content_writer(content_type)
         return example_handler.write(example.value)
@@ -508,7 +618,15 @@ class OpenAPIV3DocumentationHandler:
         if is_reference(schema):
             schema = self.resolve_reference(schema["$ref"])
 
-        return get_example_from_schema(self.expand_references(schema))
+        # the same schemas are used by many requests and responses: their examples
+        # are generated once, since they are only read by content writers
+        cached = self._examples_cache.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+
+        example = get_example_from_schema(self.expand_references(schema))
+        self._examples_cache[id(schema)] = (schema, example)
+        return example
 
     def write_content_schema(self, data) -> str:
         schema = data.get("schema")
@@ -528,7 +646,14 @@ class OpenAPIV3DocumentationHandler:
         if isinstance(reference, dict):
             reference = reference["$ref"]
         assert isinstance(reference, str)
-        return read_dict(self.doc, *reference.lstrip("#/").split("/"))
+        # the same references are resolved many times while writing the documentation,
+        # and the document is not modified after normalization
+        try:
+            return self._references_cache[reference]
+        except KeyError:
+            value = read_dict(self.doc, *reference.lstrip("#/").split("/"))
+            self._references_cache[reference] = value
+            return value
 
     def expand_references(self, schema, context: Optional[ExpandContext] = None):
         """
@@ -538,9 +663,6 @@ class OpenAPIV3DocumentationHandler:
 
         This method handles recursive references setting `null` values.
         """
-        if context is None:
-            context = ExpandContext()
-
         if is_reference(schema):
             return self.expand_references(self.resolve_reference(schema))
 
@@ -548,11 +670,28 @@ class OpenAPIV3DocumentationHandler:
             # this should not happen, but we don't want the whole build to fail
             return None
 
-        clone = copy.deepcopy(schema)
+        if not self._has_references(schema):
+            # there is nothing to expand: the schema is returned as is, since the
+            # returned value is only read
+            return schema
 
-        for key in list(clone.keys()):
-            value = clone[key]
+        if context is None:
+            # with a new context, the result only depends on the schema: schemas
+            # referenced by many operations are expanded only once (the schema is
+            # stored with its result, so its id cannot be reused by another object)
+            cached = self._expanded_schemas.get(id(schema))
+            if cached is not None and cached[0] is schema:
+                return cached[1]
+
+            expanded = self.expand_references(schema, ExpandContext())
+            self._expanded_schemas[id(schema)] = (schema, expanded)
+            return expanded
+
+        # values other than dictionaries are not modified, and the returned schema is
+        # only read, so they can be shared with the source schema
+        clone = {}
 
+        for key, value in schema.items():
             if is_reference(value):
                 ref = value["$ref"]
                 if ref in context.expanded_refs:
@@ -584,6 +723,23 @@ class OpenAPIV3DocumentationHandler:
 
         return clone
 
+    def _has_references(self, schema) -> bool:
+        """
+        Returns a value indicating whether the given schema, or any object nested in
+        it, contains a $ref property. Results are stored by schema, so each node of the
+        document is inspected only once.
+        """
+        cached = self._has_references_cache.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+
+        value = "$ref" in schema or any(
+            isinstance(item, dict) and self._has_references(item)
+            for item in schema.values()
+        )
+        self._has_references_cache[id(schema)] = (schema, value)
+        return value
+
     def get_content_writer(self, content_type: str) -> ContentWriter:
         """
         Returns a ContentWriter to create a markdown representation of the given
@@ -606,7 +762,16 @@ class OpenAPIV3DocumentationHandler:
             if not schema:
                 return []
 
-        return [[key, value] for key, value in sort_dict(schema.get("properties", {}))]
+        # properties of the same schemas are requested by several templates
+        cached = self._properties_cache.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+
+        properties = [
+            [key, value] for key, value in sort_dict(schema.get("properties", {}))
+        ]
+        self._properties_cache[id(schema)] = (schema, properties)
+        return properties
 
     def iter_schemas_bindings(self):
         """
@@ -617,7 +782,7 @@ class OpenAPIV3DocumentationHandler:
 
         for type_name, schema in schemas:
             if is_object_schema(schema):
-                for _, prop_schema in sort_dict(schema["properties"]):
+                for _, prop_schema in self.get_properties(schema):
                     if is_reference(prop_schema):
                         yield type_name, get_ref_type_name(prop_schema)
 
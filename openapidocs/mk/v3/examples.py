@@ -6,9 +6,14 @@ not included in documentation files.
 """
 import random
 from abc import ABC, abstractmethod
-from typing import Any, Callable, ClassVar, Dict, Iterable, List, Type
+from typing import Any, Callable, ClassVar, Dict, Iterable, Optional, Type
 from uuid import uuid4
 
+_handlers_types: Dict[str, Type["SchemaExampleHandler"]] = {}
+
+HANDLERS: Dict[str, "SchemaExampleHandler"] = {}
+"""Instances of example handlers by schema type, created when first used."""
+
 
 class SchemaExampleHandler(ABC):
     """
@@ -18,6 +23,16 @@ class SchemaExampleHandler(ABC):
 
     type_name: ClassVar[str]
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        type_name = getattr(cls, "type_name", "")
+
+        if type_name:
+            # the most recently defined handler for a type is used, so handlers can
+            # be replaced by subclassing them
+            _handlers_types[type_name] = cls
+            HANDLERS.pop(type_name, None)
+
     @abstractmethod
     def get_example(self, schema) -> Any:
         """
@@ -37,18 +52,25 @@ class ScalarExampleHandler(SchemaExampleHandler):
     def get_example(self, schema) -> str:
         format = schema.get("format")
 
-        if format and format in self.formats:
-            return self.formats[format]()
+        if format:
+            example_factory = self.formats.get(format)
+
+            if example_factory is not None:
+                return example_factory()
 
         return self.default
 
 
+# examples don't need unique identifiers: the same value is used for all of them
+_example_uuid = str(uuid4())
+
+
 class StringExampleHandler(ScalarExampleHandler):
     type_name = "string"
     default = "string"
     formats = {
         "email": lambda: "derp@meme.org",
-        "uuid": lambda: str(uuid4()),
+        "uuid": lambda: _example_uuid,
         "date": lambda: "2022-04-13",
         "date-time": lambda: "2022-04-13T15:42:05.901Z",
         "password": lambda: "*" * 12,
@@ -94,14 +116,15 @@ class ObjectExampleHandler(SchemaExampleHandler):
         """
         Returns an example value for a property with the given name and schema.
         """
-        properties = schema.get("properties") or {}
+        properties = schema.get("properties")
 
-        example = {}
+        if not properties:
+            return {}
 
-        for key in properties:
-            example[key] = get_example_from_schema(properties[key])
-
-        return example
+        return {
+            key: get_example_from_schema(property_schema)
+            for key, property_schema in properties.items()
+        }
 
 
 class ArrayExampleHandler(SchemaExampleHandler):
@@ -119,10 +142,11 @@ class ArrayExampleHandler(SchemaExampleHandler):
         """
         items = schema.get("items", [])
 
-        if not isinstance(items, list):
-            items = [items]
+        if isinstance(items, list):
+            return [get_example_from_schema(item) for item in items]
 
-        return [get_example_from_schema(item) for item in items]
+        # most arrays declare a single schema for their items
+        return [get_example_from_schema(items)]
 
 
 def get_subclasses(cls) -> Iterable[Type]:
@@ -131,6 +155,27 @@ def get_subclasses(cls) -> Iterable[Type]:
         yield subclass
 
 
+def get_handler(schema_type: str) -> Optional[SchemaExampleHandler]:
+    """
+    Returns the example handler for the given schema type, if any. Handlers are
+    stateless, so a single instance is used for each type.
+    """
+    if not isinstance(schema_type, str):
+        # for example, a list of types in OpenAPI 3.1 documents
+        return None
+
+    try:
+        return HANDLERS[schema_type]
+    except KeyError:
+        handler_type = _handlers_types.get(schema_type)
+
+        if handler_type is None:
+            return None
+
+        handler = HANDLERS[schema_type] = handler_type()
+        return handler
+
+
 def get_example_from_schema(schema) -> Any:
     if schema is None:
         return None
@@ -138,23 +183,15 @@ def get_example_from_schema(schema) -> Any:
     if "example" in schema:
         return schema["example"]
 
-    # does it have a type?
-    handlers_types: List[Type[SchemaExampleHandler]] = list(
-        get_subclasses(SchemaExampleHandler)
-    )
-
     schema_type = schema.get("type")
 
     if schema_type:
-        handler_type = next(
-            (_type for _type in handlers_types if _type.type_name == schema_type), None
-        )
+        handler = get_handler(schema_type)
 
-        if handler_type is None:  # pragma: nocover
+        if handler is None:  # pragma: nocover
             # fallback to returning the raw schema;
             return schema
 
-        handler = handler_type()
         return handler.get_example(schema)
     # TODO: handle special cases (allOf, anyOf, etc.)
     return None
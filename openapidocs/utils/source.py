@@ -1,30 +1,75 @@
 """
 This module provides methods to obtain OpenAPI Documentation from file or web sources.
 """
+import asyncio
+import copy
 import json
+import os
+import re
+from collections import OrderedDict
 from pathlib import Path
+from stat import S_ISREG
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+import httpx
 import yaml
 
 from openapidocs.logs import logger
 
-from .web import ensure_success, http_get
+from .web import ensure_success, http_get, http_get_many
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    # use the libyaml parser, when PyYAML is compiled with its bindings
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as YAMLLoader  # type: ignore
+
+
+def parse_json(data):
+    """
+    Parses JSON from bytes or str, using orjson if it is installed.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the json module (for example, it does not
+            # support NaN or integers bigger than 64 bits)
+            pass
+    return json.loads(data)
+
+
+def parse_yaml(data):
+    """
+    Parses YAML safely from bytes, str, or a file object, using the libyaml parser if
+    available.
+    """
+    return yaml.load(data, Loader=YAMLLoader)
 
 
 def read_from_json_file(file_path: Path):
     """
     Reads JSON from a given file by path.
     """
-    with open(file_path, "rt", encoding="utf-8") as source_file:
-        return json.loads(source_file.read())
+    # JSON is read as bytes, since parsers handle UTF-8 directly: this avoids
+    # creating an intermediate str for the whole file
+    with open(file_path, "rb") as source_file:
+        return parse_json(source_file.read())
 
 
 def read_from_yaml_file(file_path: Path):
     """
     Reads YAML from a given file by path.
     """
-    with open(file_path, "rt", encoding="utf-8") as source_file:
-        return yaml.safe_load(source_file.read())
+    # the file is given to the parser, which reads it in chunks and detects its
+    # encoding, so the whole file is never held in memory as a str
+    with open(file_path, "rb") as source_file:
+        return parse_yaml(source_file)
 
 
 class SourceError(Exception):
@@ -38,61 +83,267 @@ def read_from_url(url: str):
     This method will try to fetch JSON or YAML from the given source, in case of
     ambiguity regarding the content, it will to parse anyway the response as JSON or
     YAML (using safe load when handling YAML).
+
+    Values read from URLs whose responses have an ETag or a Last-Modified header are
+    cached, and requested again with conditional headers: when the server responds
+    with 304 Not Modified, a copy of the cached value is returned.
+    """
+    return copy.deepcopy(_read_from_url_cached(url))
+
+
+def _read_from_url_cached(url: str):
+    """
+    Reads a value from the given URL, like `read_from_url`, but returns cached values
+    as they are: they are shared by all callers, so they must not be modified.
+    """
+    cached_response = _get_cached_response(url)
+    headers = cached_response[0] if cached_response else None
+    return _read_from_response(url, http_get(url, headers), cached_response)
+
+
+_json_start = re.compile(rb"\s*[{\[]")
+
+
+def _looks_like_json(data: bytes) -> bool:
+    """
+    Returns a value indicating whether the given content looks like JSON, by its first
+    non-whitespace character, to not try parsing YAML documents as JSON.
     """
-    response = http_get(url)
+    return _json_start.match(data) is not None
 
+
+# charsets that can be read as UTF-8
+_utf8_names = frozenset({"utf-8", "utf8", "us-ascii", "ascii"})
+
+
+def _parse_yaml_response(response: httpx.Response):
+    # the YAML parser decodes UTF-8 bytes itself, so the content is decoded to str
+    # only when the response declares a different charset
+    encoding = response.charset_encoding
+
+    if encoding is None or encoding.lower() in _utf8_names:
+        return parse_yaml(response.content)
+    return parse_yaml(response.text)
+
+
+# headers to request a URL only if it changed, and the value read from it
+CachedResponse = Tuple[Dict[str, str], Any]
+
+
+_URLS_CACHE_SIZE = 32
+_urls_cache: "OrderedDict[str, CachedResponse]" = OrderedDict()
+
+
+def _get_cached_response(url: str) -> Optional[CachedResponse]:
+    """
+    Returns the headers to request the given URL only if it changed since it was
+    last read, with the value read from it, if its value is cached.
+    """
+    return _urls_cache.get(url)
+
+
+def _set_cached_response(url: str, cached_response: CachedResponse) -> None:
+    _urls_cache[url] = cached_response
+    _urls_cache.move_to_end(url)
+
+    if len(_urls_cache) > _URLS_CACHE_SIZE:
+        _urls_cache.popitem(last=False)
+
+
+def _read_from_response(
+    url: str,
+    response: httpx.Response,
+    cached_response: Optional[CachedResponse] = None,
+):
+    """
+    Reads the value of a response. cached_response is the cached value whose
+    conditional headers were sent with the request, if any: it is used when the
+    server responds with 304 Not Modified, even if it was removed from the cache in
+    the meantime.
+    """
     ensure_success(response)
 
-    data = response.text
-    content_type = response.headers.get("content-type")
+    if response.status_code == 304:
+        # the body of a 304 response is always empty: it must not be parsed
+        if cached_response is None:
+            raise SourceError(
+                "The server responded with 304 Not Modified to a request that was "
+                "not conditional."
+            )
+        # not modified since it was last read
+        _set_cached_response(url, cached_response)
+        return cached_response[1]
+
+    value = _parse_response(url, response)
+
+    headers = {}
+    etag = response.headers.get("etag")
+    if etag:
+        headers["If-None-Match"] = etag
+    last_modified = response.headers.get("last-modified")
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    if headers:
+        _set_cached_response(url, (headers, value))
+    else:
+        _urls_cache.pop(url, None)
+    return value
+
+
+def _parse_response(url: str, response: httpx.Response):
+    content = response.content
+    content_type = response.headers.get("content-type", "")
 
     if "json" in content_type or url.endswith(".json"):
-        return json.loads(data)
+        return parse_json(content)
 
-    if "yaml" in content_type or url.endswith(".yaml") or url.endswith(".yml"):
-        return yaml.safe_load(data)
+    if "yaml" in content_type or url.endswith((".yaml", ".yml")):
+        return _parse_yaml_response(response)
 
-    try:
-        return json.loads(data)
-    except json.JSONDecodeError:
+    if _looks_like_json(content):
         try:
-            return yaml.safe_load(data)
-        except yaml.YAMLError:
-            raise SourceError(
-                "Could not load a valid JSON or YAML file from the given URL."
-            )
+            return parse_json(content)
+        except ValueError:
+            # not JSON (json.JSONDecodeError), or not UTF-8 (UnicodeDecodeError)
+            pass
+
+    try:
+        return _parse_yaml_response(response)
+    except yaml.YAMLError:
+        raise SourceError(
+            "Could not load a valid JSON or YAML file from the given URL."
+        )
+
+
+_files_readers: Dict[str, Callable[[Path], Any]] = {
+    ".json": read_from_json_file,
+    ".yaml": read_from_yaml_file,
+    ".yml": read_from_yaml_file,
+}
+
+_FILES_CACHE_SIZE = 32
+_files_cache: "OrderedDict[Tuple[str, int, int], Any]" = OrderedDict()
+
+
+_url_start = re.compile(r"https?://", re.IGNORECASE)
+
+
+def _is_url(source: str) -> bool:
+    return _url_start.match(source) is not None
+
+
+def _stat_file(source: str) -> Optional[os.stat_result]:
+    """
+    Returns the status of the file at the given path, or None if it does not exist.
+    """
+    try:
+        return os.stat(source)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _read_file(
+    file_path: Path, file_stat: os.stat_result, reader: Callable[[Path], Any]
+) -> Any:
+    """
+    Reads a source file using the given reader, keeping the parsed values of the most
+    recently read files in memory, to not parse again files that did not change.
+    Files are identified by absolute path, last modification time, and size.
+    """
+    key = (os.path.abspath(file_path), file_stat.st_mtime_ns, file_stat.st_size)
+
+    try:
+        value = _files_cache[key]
+    except KeyError:
+        logger.debug("Reading from file %s", file_path)
+        value = _files_cache[key] = reader(file_path)
+
+        if len(_files_cache) > _FILES_CACHE_SIZE:
+            _files_cache.popitem(last=False)
+    else:
+        _files_cache.move_to_end(key)
+    return value
 
 
 def read_from_source(source: str):
     """
     Tries to read a JSON or YAML file from a given source.
     The source can be a path to a file, or a URL.
+
+    Values read from files are cached until files change: a copy of the cached value
+    is returned, so it can be modified.
     """
-    source_path = Path(source)
+    return copy.deepcopy(_read_from_source_cached(source))
 
-    if source_path.exists():
-        if not source_path.is_file():
-            raise ValueError("The given path is not a file path.")
 
-        logger.debug("Reading from file %s", source)
+def _read_from_source_cached(source: str):
+    """
+    Reads a JSON or YAML file from a given source, like `read_from_source`, but
+    returns values read from files as they are cached: they are shared by all
+    callers, so they must not be modified.
+    """
+    # a single stat call tells whether the source is a file, and whether the file
+    # changed since it was last read
+    file_stat = _stat_file(source)
 
-        file_path = source.lower()
+    if file_stat is not None:
+        if not S_ISREG(file_stat.st_mode):
+            raise ValueError("The given path is not a file path.")
 
-        if file_path.endswith(".json"):
-            return read_from_json_file(source_path)
+        source_path = Path(source)
+        reader = _files_readers.get(source_path.suffix.lower())
 
-        if file_path.endswith(".yaml") or file_path.endswith(".yml"):
-            return read_from_yaml_file(source_path)
+        if reader is None:
+            raise ValueError("Unsupported source file.")
 
-        raise ValueError("Unsupported source file.")
+        return _read_file(source_path, file_stat, reader)
     else:
-        source_lower = source.lower()
-
-        if source_lower.startswith("http://") or source_lower.startswith("https://"):
+        if _is_url(source):
             # fetch with a web request, read - ensure that it's JSON or YAML!
-            return read_from_url(source)
+            return _read_from_url_cached(source)
         else:
             raise ValueError(
                 "Invalid source: it must be either a path to a "
                 ".json or .yaml file, or a valid URL."
             )
+
+
+def read_from_sources(sources: Iterable[str]) -> List[Any]:
+    """
+    Reads JSON or YAML from several sources, returning their values in the same order.
+    URLs are fetched concurrently, files are read like in `read_from_source`.
+
+    This function runs an event loop, so it cannot be called from async code.
+    """
+    sources = list(sources)
+    # each URL is requested once, even if it is repeated
+    urls = list(
+        dict.fromkeys(
+            source
+            for source in sources
+            if _stat_file(source) is None and _is_url(source)
+        )
+    )
+    # cached values are taken before sending requests, since handling the responses
+    # can remove them from the cache
+    cached_responses = {url: _get_cached_response(url) for url in urls}
+    headers = {
+        url: cached_response[0]
+        for url, cached_response in cached_responses.items()
+        if cached_response is not None
+    }
+    responses = (
+        dict(zip(urls, asyncio.run(http_get_many(urls, headers.get)))) if urls else {}
+    )
+    values = {
+        url: _read_from_response(url, response, cached_responses[url])
+        for url, response in responses.items()
+    }
+
+    # values read from URLs can be cached, and the same URL can be repeated: each
+    # source gets its own copy, like values read from files
+    return [
+        copy.deepcopy(values[source]) if source in values else read_from_source(source)
+        for source in sources
+    ]
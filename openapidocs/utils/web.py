@@ -1,8 +1,43 @@
-from typing import Any
+import asyncio
+import os
+import ssl
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
+import certifi
 import httpx
 
-http_client = httpx.Client(verify=False, timeout=20)
+# connections are kept open, to reuse them when several sources are fetched from the
+# same server, like when following references to other files
+http_limits = httpx.Limits(
+    max_connections=20, max_keepalive_connections=10, keepalive_expiry=30
+)
+
+# HTTP/2 requires the optional h2 package: pip install httpx[http2]
+http2_support = find_spec("h2") is not None
+
+
+_false_values = {"N", "NO", "0", "FALSE"}
+
+
+def _get_tls_verify() -> Union[bool, ssl.SSLContext]:
+    # verification of TLS certificates can be disabled explicitly, for example to
+    # fetch documents from development servers using self-signed certificates
+    if os.environ.get("OPENAPIDOCS_TLS_VERIFY", "").upper() in _false_values:
+        return False
+    # a single SSL context is shared by all clients, so CA certificates are loaded
+    # only once
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+tls_verify = _get_tls_verify()
+
+http_client = httpx.Client(
+    verify=tls_verify,
+    timeout=20,
+    limits=http_limits,
+    http2=http2_support,
+)
 
 
 class FailedRequestError(Exception):
@@ -25,8 +60,37 @@ def ensure_success(response: httpx.Response) -> None:
         )
 
 
-def http_get(url: str) -> Any:
+def http_get(url: str, headers: Optional[Dict[str, str]] = None) -> Any:
     try:
-        return http_client.get(url)
+        return http_client.get(url, headers=headers)
     except httpx.HTTPError as http_error:
         raise FailedRequestError(str(http_error)) from http_error
+
+
+async def _async_http_get(
+    client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]] = None
+) -> httpx.Response:
+    try:
+        return await client.get(url, headers=headers)
+    except httpx.HTTPError as http_error:
+        raise FailedRequestError(str(http_error)) from http_error
+
+
+async def http_get_many(
+    urls: Iterable[str],
+    get_headers: Optional[Callable[[str], Optional[Dict[str, str]]]] = None,
+) -> List[httpx.Response]:
+    """
+    Sends GET requests to the given URLs concurrently, returning their responses in
+    the same order. If given, get_headers returns the request headers for each URL.
+    """
+    # an async client is bound to the event loop that uses it, so it is not shared
+    async with httpx.AsyncClient(
+        verify=tls_verify, timeout=20, limits=http_limits, http2=http2_support
+    ) as client:
+        return await asyncio.gather(
+            *[
+                _async_http_get(client, url, get_headers(url) if get_headers else None)
+                for url in urls
+            ]
+        )
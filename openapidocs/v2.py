@@ -3,17 +3,21 @@ This module defines classes that can be used to generate OpenAPI Documentation
 version 2.
 https://swagger.io/specification/v2/
 """
+from __future__ import annotations
+
 from abc import ABC
-from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Type, Union
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Type, Union
 
-from openapidocs.common import OpenAPIRoot
+from openapidocs.common import OpenAPIRoot, slots_dataclass
 
 from .common import OpenAPIElement
 
 
+@lru_cache(maxsize=1024)
 def get_ref(ref_type: Union[str, Type]) -> str:
+    # references are created for the same few types many times
     if isinstance(ref_type, str):
         return f"#/definitions/{ref_type}"
     return f"#/definitions/{ref_type.__name__}"
@@ -92,26 +96,26 @@ class OAuthFlowType(Enum):
     ACCESS_CODE = "accessCode"
 
 
-@dataclass
+@slots_dataclass
 class Contact(OpenAPIElement):
     name: Optional[str] = None
     url: Optional[str] = None
     email: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class ExternalDocs(OpenAPIElement):
     url: str
     description: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class License(OpenAPIElement):
     name: str
     url: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class Info(OpenAPIElement):
     title: str
     version: str
@@ -121,7 +125,7 @@ class Info(OpenAPIElement):
     license: Optional[License] = None
 
 
-@dataclass
+@slots_dataclass
 class XML(OpenAPIElement):
     name: Optional[str] = None
     namespace: Optional[str] = None
@@ -130,13 +134,13 @@ class XML(OpenAPIElement):
     wrapped: Optional[bool] = None
 
 
-@dataclass
+@slots_dataclass
 class Discriminator(OpenAPIElement):
     property_name: str
     mapping: Optional[Dict[str, str]] = None
 
 
-@dataclass
+@slots_dataclass
 class Schema(OpenAPIElement):
     type: Union[None, str, ValueType] = None
     format: Union[None, str, ValueFormat] = None
@@ -164,7 +168,7 @@ class Schema(OpenAPIElement):
     not_: Optional[List[Union["Schema", "Reference"]]] = None
 
 
-@dataclass
+@slots_dataclass
 class Header(OpenAPIElement):
     type: HeaderType
     description: Optional[str] = None
@@ -186,7 +190,7 @@ class Header(OpenAPIElement):
     multiple_of: Optional[float] = None
 
 
-@dataclass
+@slots_dataclass
 class Example(OpenAPIElement):
     summary: Optional[str] = None
     description: Optional[str] = None
@@ -194,7 +198,7 @@ class Example(OpenAPIElement):
     external_value: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class Reference(OpenAPIElement):
     ref: str
 
@@ -202,7 +206,7 @@ class Reference(OpenAPIElement):
         return {"$ref": self.ref}
 
 
-@dataclass
+@slots_dataclass
 class Encoding(OpenAPIElement):
     content_type: Optional[str] = None
     headers: Optional[Dict[str, Union[Header, Reference]]] = None
@@ -211,7 +215,7 @@ class Encoding(OpenAPIElement):
     allow_reserved: Optional[bool] = None
 
 
-@dataclass
+@slots_dataclass
 class Response(OpenAPIElement):
     description: str
     headers: Optional[Dict[str, Union[Header, Reference]]] = None
@@ -219,7 +223,7 @@ class Response(OpenAPIElement):
     examples: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@slots_dataclass
 class Items(OpenAPIElement):
     type: ValueItemType
     format: Optional[ValueFormat] = None
@@ -240,7 +244,7 @@ class Items(OpenAPIElement):
     multiple_of: Optional[float] = None
 
 
-@dataclass
+@slots_dataclass
 class Parameter(OpenAPIElement):
     name: str
     in_: ParameterLocation
@@ -269,7 +273,7 @@ class Parameter(OpenAPIElement):
     required: Optional[bool] = None
 
 
-@dataclass
+@slots_dataclass
 class SecurityRequirement(OpenAPIElement):
     name: str
     value: List[str]
@@ -278,7 +282,7 @@ class SecurityRequirement(OpenAPIElement):
         return {self.name: self.value}
 
 
-@dataclass
+@slots_dataclass
 class Operation(OpenAPIElement):
     responses: Dict[str, Response]
     tags: Optional[List[str]] = None
@@ -294,7 +298,7 @@ class Operation(OpenAPIElement):
     security: Optional[List[SecurityRequirement]] = None
 
 
-@dataclass
+@slots_dataclass
 class PathItem(OpenAPIElement):
     ref: Optional[str] = None
     get: Optional[Operation] = None
@@ -310,14 +314,16 @@ class PathItem(OpenAPIElement):
 class SecurityScheme(OpenAPIElement, ABC):
     """Abstract security scheme"""
 
+    __slots__ = ()
+
 
-@dataclass
+@slots_dataclass
 class BasicSecurity(SecurityScheme):
     type: SecuritySchemeType = SecuritySchemeType.BASIC
     description: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class APIKeySecurity(SecurityScheme):
     name: str
     in_: APIKeyLocation
@@ -325,7 +331,7 @@ class APIKeySecurity(SecurityScheme):
     description: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class OAuth2Security(SecurityScheme):
     flow: OAuthFlowType
     scopes: Dict[str, str]
@@ -335,14 +341,14 @@ class OAuth2Security(SecurityScheme):
     description: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class Tag(OpenAPIElement):
     name: str
     description: Optional[str] = None
     external_docs: Optional[ExternalDocs] = None
 
 
-@dataclass
+@slots_dataclass
 class OpenAPI(OpenAPIRoot):
     swagger: str = "2.0"
     info: Optional[Info] = None
@@ -359,3 +365,36 @@ class OpenAPI(OpenAPIRoot):
     security: Optional[List[SecurityRequirement]] = None
     tags: Optional[List[Tag]] = None
     external_docs: Optional[ExternalDocs] = None
+
+
+def iter_schemas(root: Union[Schema, Reference]) -> Iterable[Union[Schema, Reference]]:
+    """
+    Yields the given schema and all schemas and references nested in it, once each,
+    depth-first and in the order they are defined. Schemas are walked using a stack
+    instead of recursion, so deep schemas don't cost a function call per node.
+    """
+    stack: List[Union[Schema, Reference]] = [root]
+    # schemas can contain themselves, and the same schema can be used in several
+    # places: each one is yielded once
+    visited: Set[int] = set()
+
+    while stack:
+        item = stack.pop()
+        if id(item) in visited:
+            continue
+        visited.add(id(item))
+        yield item
+
+        if not isinstance(item, Schema):
+            continue
+
+        # children are pushed in reverse order, so they are popped in their order
+        for group in (item.not_, item.one_of, item.any_of, item.all_of):
+            if group:
+                stack.extend(reversed(group))
+
+        if item.items is not None:
+            stack.append(item.items)
+
+        if item.properties:
+            stack.extend(reversed(item.properties.values()))
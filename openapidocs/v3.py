@@ -5,11 +5,10 @@ https://swagger.io/specification/
 """
 
 from abc import ABC
-from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 
-from openapidocs.common import OpenAPIRoot, normalize_dict
+from openapidocs.common import OpenAPIRoot, normalize_dict, slots_dataclass
 
 from .common import OpenAPIElement
 
@@ -55,26 +54,26 @@ class SecuritySchemeType(Enum):
     OPENIDCONNECT = "openIdConnect"
 
 
-@dataclass
+@slots_dataclass
 class Contact(OpenAPIElement):
     name: Optional[str] = None
     url: Optional[str] = None
     email: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class ExternalDocs(OpenAPIElement):
     url: str
     description: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class License(OpenAPIElement):
     name: str
     url: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class Info(OpenAPIElement):
     title: str
     version: str
@@ -84,21 +83,21 @@ class Info(OpenAPIElement):
     license: Optional[License] = None
 
 
-@dataclass
+@slots_dataclass
 class ServerVariable(OpenAPIElement):
     default: str
     description: Optional[str] = None
     enum: Optional[List[str]] = None
 
 
-@dataclass
+@slots_dataclass
 class Server(OpenAPIElement):
     url: str
     description: Optional[str] = None
     variables: Optional[Dict[str, ServerVariable]] = None
 
 
-@dataclass
+@slots_dataclass
 class XML(OpenAPIElement):
     name: Optional[str] = None
     namespace: Optional[str] = None
@@ -107,13 +106,13 @@ class XML(OpenAPIElement):
     wrapped: Optional[bool] = None
 
 
-@dataclass
+@slots_dataclass
 class Discriminator(OpenAPIElement):
     property_name: str
     mapping: Optional[Dict[str, str]] = None
 
 
-@dataclass
+@slots_dataclass
 class Schema(OpenAPIElement):
     type: Union[None, str, ValueType] = None
     format: Union[None, str, ValueFormat] = None
@@ -141,13 +140,13 @@ class Schema(OpenAPIElement):
     not_: Optional[List[Union["Schema", "Reference"]]] = None
 
 
-@dataclass
+@slots_dataclass
 class Header(OpenAPIElement):
     description: Optional[str] = None
     schema: Union[None, Schema, "Reference"] = None
 
 
-@dataclass
+@slots_dataclass
 class Example(OpenAPIElement):
     summary: Optional[str] = None
     description: Optional[str] = None
@@ -155,7 +154,7 @@ class Example(OpenAPIElement):
     external_value: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class Reference(OpenAPIElement):
     ref: str
 
@@ -163,7 +162,7 @@ class Reference(OpenAPIElement):
         return {"$ref": self.ref}
 
 
-@dataclass
+@slots_dataclass
 class Encoding(OpenAPIElement):
     content_type: Optional[str] = None
     headers: Optional[Dict[str, Union[Header, Reference]]] = None
@@ -172,7 +171,7 @@ class Encoding(OpenAPIElement):
     allow_reserved: Optional[bool] = None
 
 
-@dataclass
+@slots_dataclass
 class Link(OpenAPIElement):
     operation_ref: Optional[str] = None
     operation_id: Optional[str] = None
@@ -182,7 +181,7 @@ class Link(OpenAPIElement):
     server: Optional[Server] = None
 
 
-@dataclass
+@slots_dataclass
 class MediaType(OpenAPIElement):
     schema: Union[None, Schema, Reference] = None
     example: Any = None
@@ -190,7 +189,7 @@ class MediaType(OpenAPIElement):
     encoding: Optional[Dict[str, Encoding]] = None
 
 
-@dataclass
+@slots_dataclass
 class Response(OpenAPIElement):
     description: Optional[str] = None
     headers: Optional[Dict[str, Union[Header, Reference]]] = None
@@ -198,7 +197,7 @@ class Response(OpenAPIElement):
     links: Optional[Dict[str, Union[Link, Reference]]] = None
 
 
-@dataclass
+@slots_dataclass
 class Parameter(OpenAPIElement):
     name: str
     in_: ParameterLocation
@@ -212,14 +211,14 @@ class Parameter(OpenAPIElement):
     examples: Optional[Dict[str, Union[Example, Reference]]] = None
 
 
-@dataclass
+@slots_dataclass
 class RequestBody(OpenAPIElement):
     content: Dict[str, MediaType]
     required: Optional[bool] = None
     description: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class SecurityRequirement(OpenAPIElement):
     name: str
     value: List[str]
@@ -228,7 +227,7 @@ class SecurityRequirement(OpenAPIElement):
         return {self.name: self.value}
 
 
-@dataclass
+@slots_dataclass
 class Operation(OpenAPIElement):
     responses: Dict[str, Response]
     tags: Optional[List[str]] = None
@@ -244,7 +243,7 @@ class Operation(OpenAPIElement):
     servers: Optional[List[Server]] = None
 
 
-@dataclass
+@slots_dataclass
 class PathItem(OpenAPIElement):
     summary: Optional[str] = None
     ref: Optional[str] = None
@@ -261,7 +260,7 @@ class PathItem(OpenAPIElement):
     parameters: Optional[List[Union[Parameter, Reference]]] = None
 
 
-@dataclass
+@slots_dataclass
 class Callback(OpenAPIElement):
     expression: str
     path: PathItem
@@ -270,7 +269,7 @@ class Callback(OpenAPIElement):
         return {self.expression: normalize_dict(self.path)}
 
 
-@dataclass
+@slots_dataclass
 class OAuthFlow(OpenAPIElement):
     scopes: Dict[str, str]
     authorization_url: Optional[str] = None
@@ -278,7 +277,7 @@ class OAuthFlow(OpenAPIElement):
     refresh_url: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class OAuthFlows(OpenAPIElement):
     implicit: Optional[OAuthFlow] = None
     password: Optional[OAuthFlow] = None
@@ -289,8 +288,10 @@ class OAuthFlows(OpenAPIElement):
 class SecurityScheme(OpenAPIElement, ABC):
     """Abstract security scheme"""
 
+    __slots__ = ()
 
-@dataclass
+
+@slots_dataclass
 class HTTPSecurity(SecurityScheme):
     scheme: str
     type: SecuritySchemeType = SecuritySchemeType.HTTP
@@ -298,7 +299,7 @@ class HTTPSecurity(SecurityScheme):
     bearer_format: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class APIKeySecurity(SecurityScheme):
     name: str
     in_: ParameterLocation
@@ -306,21 +307,21 @@ class APIKeySecurity(SecurityScheme):
     description: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class OAuth2Security(SecurityScheme):
     flows: OAuthFlows
     type: SecuritySchemeType = SecuritySchemeType.OAUTH2
     description: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class OpenIdConnectSecurity(SecurityScheme):
     open_id_connect_url: str
     type: SecuritySchemeType = SecuritySchemeType.OPENIDCONNECT
     description: Optional[str] = None
 
 
-@dataclass
+@slots_dataclass
 class Components(OpenAPIElement):
     schemas: Optional[Dict[str, Union[Schema, Reference]]] = None
     responses: Optional[Dict[str, Union[Response, Reference]]] = None
@@ -333,14 +334,14 @@ class Components(OpenAPIElement):
     callbacks: Optional[Dict[str, Union[Callback, Reference]]] = None
 
 
-@dataclass
+@slots_dataclass
 class Tag(OpenAPIElement):
     name: str
     description: Optional[str] = None
     external_docs: Optional[ExternalDocs] = None
 
 
-@dataclass
+@slots_dataclass
 class Security(OpenAPIElement):
     requirements: List[SecurityRequirement]
     optional: bool = False
@@ -352,7 +353,7 @@ class Security(OpenAPIElement):
         return items
 
 
-@dataclass
+@slots_dataclass
 class OpenAPI(OpenAPIRoot):
     openapi: str = "3.0.3"
     info: Optional[Info] = None
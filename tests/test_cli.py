@@ -1,3 +1,4 @@
+import ssl
 from pathlib import Path
 from uuid import uuid4
 
@@ -9,8 +10,28 @@ from click.testing import CliRunner
 from openapidocs.commands.docs import generate_documents_command
 from openapidocs.main import main
 from openapidocs.mk.jinja import OutputStyle
-from openapidocs.utils.source import SourceError, read_from_source, read_from_url
-from openapidocs.utils.web import FailedRequestError, ensure_success, http_get
+from openapidocs.utils.source import (
+    _URLS_CACHE_SIZE,
+    SourceError,
+    _get_cached_response,
+    _is_url,
+    _looks_like_json,
+    _read_from_response,
+    _read_from_source_cached,
+    _read_from_url_cached,
+    parse_json,
+    parse_yaml,
+    read_from_source,
+    read_from_sources,
+    read_from_url,
+)
+from openapidocs.utils.web import (
+    FailedRequestError,
+    _get_tls_verify,
+    ensure_success,
+    http_client,
+    http_get,
+)
 from tests.common import compatible_str, get_file_json
 
 from .serverfixtures import *  # noqa
@@ -233,3 +254,209 @@ def test_read_from_source_invalid_source():
         read_from_source("tests/res/example1-output.md")
 
     assert str(error.value) == "Unsupported source file."
+
+
+def test_parse_json_supports_standard_library_extensions():
+    data = parse_json('{"big": 100000000000000000000000, "nan": NaN}')
+
+    assert data["big"] == 100000000000000000000000
+    assert data["nan"] != data["nan"]
+
+
+def test_parse_json_supports_bytes():
+    assert parse_json('{"name": "François"}'.encode("utf8")) == {"name": "François"}
+    assert parse_json(b'{"max": 18446744073709551615}') == {"max": 2**64 - 1}
+
+
+def test_parse_json_raises_for_invalid_json():
+    with pytest.raises(ValueError):
+        parse_json("openapi: 3.0.0")
+
+
+def test_parse_yaml(example_1_data):
+    with open("tests/res/example1-openapi.yaml", mode="rt", encoding="utf8") as source:
+        assert parse_yaml(source.read()) == example_1_data
+
+
+def test_parse_yaml_from_stream(example_1_data):
+    with open("tests/res/example1-openapi.yaml", mode="rb") as source:
+        assert parse_yaml(source) == example_1_data
+
+
+def test_read_from_source_caches_files(tmp_path):
+    source_file = tmp_path / "openapi.json"
+    source_file.write_text('{"openapi": "3.0.0"}', encoding="utf8")
+
+    data = _read_from_source_cached(str(source_file))
+
+    assert data == {"openapi": "3.0.0"}
+    assert _read_from_source_cached(str(source_file)) is data
+
+    # the public function returns copies of cached values, that can be modified
+    value = read_from_source(str(source_file))
+    assert value == data
+    assert value is not data
+    value["openapi"] = "3.1.0"
+    assert read_from_source(str(source_file)) == {"openapi": "3.0.0"}
+
+    # files are read again when they change
+    # (with a different size, since modification times can have a coarse resolution)
+    source_file.write_text('{"openapi": "3.1.0", "info": {}}', encoding="utf8")
+
+    assert read_from_source(str(source_file)) == {"openapi": "3.1.0", "info": {}}
+
+
+def test_read_from_sources(example_1_data):
+    values = read_from_sources(
+        [
+            f"{BASE_URL}/example1-openapi.json",
+            "tests/res/example1-openapi.yaml",
+            f"{BASE_URL}/example1-openapi.yaml",
+        ]
+    )
+
+    assert values == [example_1_data, example_1_data, example_1_data]
+
+
+def test_read_from_sources_failed_request():
+    with pytest.raises(FailedRequestError):
+        read_from_sources(
+            [f"{BASE_URL}/example1-openapi.json", f"{BASE_URL}/missing-file.json"]
+        )
+
+
+@pytest.mark.parametrize("file_name", ["openapi.JSON", "openapi.yml", "openapi.Yaml"])
+def test_read_from_source_by_file_extension(tmp_path, file_name):
+    source_file = tmp_path / file_name
+    source_file.write_text('{"openapi": "3.0.0"}', encoding="utf8")
+
+    assert read_from_source(str(source_file)) == {"openapi": "3.0.0"}
+
+
+def test_tls_verification_can_be_disabled(monkeypatch):
+    monkeypatch.delenv("OPENAPIDOCS_TLS_VERIFY", raising=False)
+    assert isinstance(_get_tls_verify(), ssl.SSLContext)
+
+    monkeypatch.setenv("OPENAPIDOCS_TLS_VERIFY", "0")
+    assert _get_tls_verify() is False
+
+
+@pytest.mark.parametrize(
+    "content,expected_result",
+    [
+        (b'{"openapi": "3.0.0"}', True),
+        (b'\n  \t[{"openapi": "3.0.0"}]', True),
+        (b"openapi: 3.0.0", False),
+        (b"# comment\nopenapi: 3.0.0", False),
+        (b"{openapi: 3.0.0}", True),
+        (b"", False),
+    ],
+)
+def test_looks_like_json(content, expected_result):
+    assert _looks_like_json(content) is expected_result
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b'\n{"openapi": "3.0.0"}', b"openapi: 3.0.0", b"{openapi: 3.0.0}"],
+)
+def test_read_from_response_with_ambiguous_content_type(content):
+    response = httpx.Response(
+        200, headers={"content-type": "text/plain"}, content=content
+    )
+
+    assert _read_from_response("http://example.com/openapi", response) == {
+        "openapi": "3.0.0"
+    }
+
+
+@pytest.mark.parametrize(
+    "source,expected_result",
+    [
+        ("http://example.com/openapi.json", True),
+        ("https://example.com/openapi.json", True),
+        ("HTTPS://example.com/openapi.json", True),
+        ("ftp://example.com/openapi.json", False),
+        ("tests/res/example1-openapi.json", False),
+        ("openapi-http://", False),
+    ],
+)
+def test_is_url(source, expected_result):
+    assert _is_url(source) is expected_result
+
+
+@pytest.mark.parametrize(
+    "content_type,content",
+    [
+        ("application/yaml", "title: Café".encode("utf8")),
+        ("application/yaml; charset=utf-8", "title: Café".encode("utf8")),
+        ("application/yaml; charset=iso-8859-1", "title: Café".encode("latin-1")),
+        (None, "title: Café".encode("utf8")),
+    ],
+)
+def test_read_yaml_from_response(content_type, content):
+    headers = {"content-type": content_type} if content_type else {}
+    response = httpx.Response(200, headers=headers, content=content)
+
+    assert _read_from_response("http://example.com/openapi", response) == {
+        "title": "Café"
+    }
+
+
+def test_http_client_accepts_compressed_responses():
+    assert "gzip" in http_client.headers["accept-encoding"]
+
+
+def test_read_from_url_uses_conditional_requests(example_1_data):
+    url = f"{BASE_URL}/example1-openapi.json"
+    data = _read_from_url_cached(url)
+
+    assert data == example_1_data
+
+    # the test server sends ETag and Last-Modified headers for static files
+    cached_response = _get_cached_response(url)
+    assert cached_response is not None
+
+    headers, cached_value = cached_response
+    assert "If-None-Match" in headers
+    assert cached_value is data
+
+    response = http_get(url, headers)
+    assert response.status_code == 304
+
+    # the cached value is returned when the server responds with 304 Not Modified
+    assert _read_from_url_cached(url) is data
+
+    # public functions return copies of cached values, that can be modified
+    for value in (read_from_url(url), read_from_sources([url, url])[1]):
+        assert value == data
+        assert value is not data
+        value["info"] = None
+
+    assert read_from_url(url) == example_1_data
+
+
+def test_read_from_sources_more_urls_than_cached(example_1_data):
+    # query strings make distinct URLs for the same static file
+    urls = [
+        f"{BASE_URL}/example1-openapi.json?i={i}" for i in range(_URLS_CACHE_SIZE + 8)
+    ]
+
+    assert read_from_sources(urls) == [example_1_data] * len(urls)
+    # the second time, some responses are 304 Not Modified for URLs whose cached
+    # values are removed from the cache while handling other responses
+    assert read_from_sources(urls) == [example_1_data] * len(urls)
+
+
+def test_read_from_sources_duplicate_urls(example_1_data):
+    url = f"{BASE_URL}/example1-openapi.yaml"
+
+    assert read_from_sources([url, url]) == [example_1_data, example_1_data]
+    assert read_from_sources([url, url]) == [example_1_data, example_1_data]
+
+
+def test_read_from_response_not_modified_without_cached_value():
+    response = httpx.Response(304)
+
+    with pytest.raises(SourceError):
+        _read_from_response("http://example.com/openapi.json", response)
@@ -1,14 +1,28 @@
 from dataclasses import dataclass
+from datetime import date, datetime, time
 from enum import Enum
+from typing import List, Optional
+from uuid import UUID
 
 import pytest
 
+from openapidocs import common
 from openapidocs.common import (
+    CommonBuiltInTypesHandler,
+    OpenAPIElement,
     Serializer,
+    ValueTypeHandler,
+    _asdict_inner,
+    _element_asdict_function,
+    _find_cycle,
+    _normalize_value,
     normalize_dict,
     normalize_dict_factory,
     normalize_key,
+    regular_dict_factory,
 )
+from openapidocs.mk.contents import json_default
+from openapidocs.v2 import APIKeyLocation, APIKeySecurity
 
 
 class ExampleType(Enum):
@@ -30,6 +44,10 @@ def test_serializer_raises_for_unsupported_class():
         ("one", "one"),
         ("snake_case", "snakeCase"),
         ("snake_case_really", "snakeCaseReally"),
+        ("open_id_connect_url", "openIdConnectUrl"),
+        ("not_", "not"),
+        ("double__underscore", "doubleUnderscore"),
+        ("client_2fa_code", "client2FaCode"),
         (10, 10),
         (ExampleType.A, "a"),
     ],
@@ -48,6 +66,34 @@ def test_normalize_dict_factory():
     assert normalize_dict_factory(values) == {"a": {"x": 1}}
 
 
+def test_normalize_dict_methods_defined_per_instance():
+    class Proxy:
+        def __init__(self, value):
+            self.value = value
+
+        def __getattr__(self, name):
+            if name == "to_obj":
+                return lambda: {"proxied": self.value}
+            raise AttributeError(name)
+
+    class Model:
+        pass
+
+    model = Model()
+    model.dict = lambda: {"a": 1}
+
+    @dataclass
+    class Item(OpenAPIElement):
+        first: Proxy
+        second: Model
+
+    assert normalize_dict(Item(Proxy(1), model)) == {
+        "first": {"proxied": 1},
+        "second": {"a": 1},
+    }
+    assert normalize_dict_factory([("a", Proxy(2))]) == {"a": {"proxied": 2}}
+
+
 def test_normalize_dict_normal_dataclass():
     @dataclass
     class Foo:
@@ -66,3 +112,129 @@ def test_normalize_dict_class_with_dict_method():
             return {"a": "Foo", "b": 500}
 
     assert normalize_dict(Foo()) == Foo().dict()
+
+
+def test_normalize_dict_handles_sets():
+    @dataclass
+    class Foo(OpenAPIElement):
+        tags: set
+
+    assert normalize_dict(Foo(tags={"a"})) == {"tags": ["a"]}
+
+
+def test_normalize_dict_enum_values():
+    item = APIKeySecurity(name="X-API-Key", in_=APIKeyLocation.HEADER)
+    expected_result = {"name": "X-API-Key", "in": "header", "type": "apiKey"}
+
+    # enum types are registered in the first call, and then looked up
+    assert normalize_dict(item) == expected_result
+    assert normalize_dict(item) == expected_result
+
+
+def test_normalize_dict_element():
+    @dataclass
+    class Item(OpenAPIElement):
+        snake_case: str
+        ref: Optional[str] = None
+        example_type: Optional[ExampleType] = None
+        children: Optional[List["Item"]] = None
+
+    item = Item("a", children=[Item("b", ref="#/c", example_type=ExampleType.B)])
+
+    assert normalize_dict(item) == {
+        "snakeCase": "a",
+        "children": [{"snakeCase": "b", "$ref": "#/c", "exampleType": "b"}],
+    }
+    assert _element_asdict_function(Item) is _element_asdict_function(Item)
+
+
+def test_asdict_inner_element_with_other_dict_factory():
+    @dataclass
+    class Item(OpenAPIElement):
+        snake_case: str
+        ref: Optional[str] = None
+
+    assert _asdict_inner(Item("a"), regular_dict_factory) == {
+        "snake_case": "a",
+        "ref": None,
+    }
+
+
+class UpperCaseUUIDHandler(ValueTypeHandler):
+    def normalize(self, value):
+        if isinstance(value, UUID):
+            return str(value).upper()
+        return value
+
+
+def test_normalize_dict_custom_types_handlers(monkeypatch):
+    monkeypatch.setattr(
+        common,
+        "TYPES_HANDLERS",
+        [UpperCaseUUIDHandler(), CommonBuiltInTypesHandler()],
+    )
+
+    @dataclass
+    class Foo:
+        id: UUID
+        kind: ExampleType
+
+    value = UUID("d2c1a3f6-5d8e-4a2b-9c1e-2b7f0e6a9d3c")
+
+    assert normalize_dict(Foo(value, ExampleType.A)) == {
+        "id": "D2C1A3F6-5D8E-4A2B-9C1E-2B7F0E6A9D3C",
+        "kind": "a",
+    }
+    assert regular_dict_factory([("id", value)]) == {
+        "id": "D2C1A3F6-5D8E-4A2B-9C1E-2B7F0E6A9D3C"
+    }
+
+
+def test_normalize_dict_element_custom_types_handlers(monkeypatch):
+    @dataclass
+    class Item(OpenAPIElement):
+        item_id: UUID
+        name: str
+        ref: Optional[str] = None
+
+    value = UUID("d2c1a3f6-5d8e-4a2b-9c1e-2b7f0e6a9d3c")
+    item = Item(value, "a", ref="#/b")
+
+    assert normalize_dict(item) == {"itemId": str(value), "name": "a", "$ref": "#/b"}
+
+    monkeypatch.setattr(
+        common,
+        "TYPES_HANDLERS",
+        [UpperCaseUUIDHandler(), CommonBuiltInTypesHandler()],
+    )
+
+    assert normalize_dict(item) == {
+        "itemId": "D2C1A3F6-5D8E-4A2B-9C1E-2B7F0E6A9D3C",
+        "name": "a",
+        "$ref": "#/b",
+    }
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        UUID("d2c1a3f6-5d8e-4a2b-9c1e-2b7f0e6a9d3c"),
+        time(10, 30),
+        date(2022, 4, 13),
+        datetime(2022, 4, 13, 15, 42, 5),
+        b"Lorem ipsum",
+        ExampleType.A,
+    ],
+)
+def test_normalize_value_matches_json_default(value):
+    assert _normalize_value(value) == json_default(value)
+    assert _normalize_value(value) == CommonBuiltInTypesHandler().normalize(value)
+
+
+def test_find_cycle():
+    shared = {"a": [1, 2]}
+    assert _find_cycle([shared, shared, {"b": shared}]) is None
+
+    value = {"a": [1, {}]}
+    value["a"][1]["b"] = value["a"]
+    assert _find_cycle(value) == ("dict['a'][1]['b']", "dict['a']")
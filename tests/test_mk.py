@@ -2,10 +2,16 @@ from datetime import date
 
 import pytest
 
-from openapidocs.mk import get_http_status_phrase, read_dict
+from openapidocs.mk import (
+    get_http_status_phrase,
+    read_dict,
+    read_dict2,
+    read_dict3,
+    sort_dict,
+)
 from openapidocs.mk.common import is_array_schema, is_object_schema
 from openapidocs.mk.contents import JSONContentWriter
-from openapidocs.mk.md import normalize_link
+from openapidocs.mk.md import normalize_link, write_table
 
 
 def test_get_http_status_phrase():
@@ -14,6 +20,12 @@ def test_get_http_status_phrase():
     assert get_http_status_phrase("foo") == ""
 
 
+def test_sort_dict():
+    assert sort_dict({"b": 2, "C": 3, "a": 1}) == [("a", 1), ("b", 2), ("C", 3)]
+    assert sort_dict({404: "Not Found", 200: "OK"}) == [(200, "OK"), (404, "Not Found")]
+    assert sort_dict({}) == []
+
+
 def test_is_array_schema():
     assert is_array_schema({}) is False
     assert is_array_schema(1) is False
@@ -26,6 +38,38 @@ def test_read_dict_raises_for_non_dict_property():
         read_dict({"x": 1}, "x", "a")
 
 
+@pytest.mark.parametrize(
+    "obj,expected_result",
+    [
+        ({}, ...),
+        ({"a": None}, ...),
+        ({"a": {}}, ...),
+        ({"a": {"b": None}}, ...),
+        ({"a": {"b": False}}, False),
+        ({"a": {"b": {"c": 1}}}, {"c": 1}),
+    ],
+)
+def test_read_dict2(obj, expected_result):
+    assert read_dict2(obj, "a", "b", default=...) == expected_result
+    assert read_dict2(obj, "a", "b", default=...) == read_dict(
+        obj, "a", "b", default=...
+    )
+
+
+def test_read_dict3():
+    assert read_dict3({"a": {"b": {"c": True}}}, "a", "b", "c") is True
+    assert read_dict3({"a": {"b": {}}}, "a", "b", "c", default=...) is ...
+    assert read_dict3({"a": {}}, "a", "b", "c", default=...) is ...
+
+
+def test_read_dict2_raises_for_non_dict_property():
+    with pytest.raises(ValueError):
+        read_dict2({"x": 1}, "x", "a")
+
+    with pytest.raises(ValueError):
+        read_dict3({"x": {"y": 1}}, "x", "y", "a")
+
+
 def test_read_dict_default():
     value = read_dict({"x": {}}, "x a", default=...)
     assert value is ...
@@ -40,6 +84,11 @@ def test_is_object_schema():
     assert is_object_schema({"type": "object", "properties": {}}) is True
 
 
+def test_normalize_link():
+    assert normalize_link("openapidocs.v3.Schema") == "openapidocsv3Schema"
+    assert normalize_link("Schema") == "Schema"
+
+
 def test_normalize_link_raises():
     with pytest.raises(ValueError):
         normalize_link(None)  # type: ignore
@@ -60,3 +109,29 @@ def test_content_writer_dates():
     value = writer.write({"date": date(1986, 5, 30)})
 
     assert value == expected_value
+
+
+def test_write_table_supports_generators():
+    matrix = [["Name", "Value"], ["a", 1], ["long name", 200]]
+    expected_value = """
+| Name      | Value |
+| --------- | ----- |
+| a         | 1     |
+| long name | 200   |
+    """.strip()
+
+    assert write_table(matrix) == expected_value
+    assert write_table(row for row in matrix) == expected_value
+
+
+@pytest.mark.parametrize(
+    "matrix",
+    [
+        [["a", "bb", ""], ["c", ""]],
+        [["a", "bb"], ["c", "d", "e"]],
+        [["a", "bb"], ["c"]],
+    ],
+)
+def test_write_table_raises_for_rows_of_different_lengths(matrix):
+    with pytest.raises(ValueError):
+        write_table(matrix)
@@ -1,6 +1,14 @@
+import json
+from datetime import date, datetime, time
+from enum import Enum
 from urllib.parse import urlencode
+from uuid import UUID
 
-from openapidocs.mk.contents import FormContentWriter
+import pytest
+from essentials.json import dumps
+
+from openapidocs.mk import contents
+from openapidocs.mk.contents import FormContentWriter, OADJSONEncoder, write_json
 
 
 def test_form_content_writer():
@@ -11,3 +19,76 @@ def test_form_content_writer():
 
     assert writer.handle_content_type("x-www-form-urlencoded") is True
     assert writer.handle_content_type("application/json") is False
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {},
+        [],
+        {"a": {"b": [1, 2, {"c": None}], "d": []}, "e": {}},
+        {"text": "Lorem\nipsum", "unicode": "Ciao, мир 🐍", "quote": '"'},
+        {
+            "id": UUID("00000000-0000-0000-0000-000000000000"),
+            "one": time(10, 30),
+            "two": date(2022, 4, 13),
+            "three": datetime(2022, 4, 13, 15, 42, 5),
+            "four": b"Lorem ipsum",
+        },
+        {1: "one", "big": 2**70, "float": 10.12},
+    ],
+)
+def test_write_json_matches_standard_library(value, monkeypatch):
+    expected_value = dumps(value, indent=4, cls=OADJSONEncoder)
+    assert write_json(value) == expected_value
+
+    monkeypatch.setattr(contents, "orjson", None)
+    assert write_json(value) == expected_value
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"nan": float("nan")},
+        {"infinity": float("inf"), "negative": float("-inf")},
+        {"small": 1e-05, "big": 1e16, "huge": 1.5e300, "negative": -2.5e-7},
+        {"values": [0.0, -0.0, 0.1, 1.0, 1e15, 9999.5, {"nested": [1e-10]}]},
+        {1e16: "a", 0.5: "b", 2: "c", True: "d", None: "e"},
+        {"nested": {2: [1, 2]}},
+    ],
+)
+def test_write_json_floats_match_standard_library(value):
+    assert write_json(value) == json.dumps(value, indent=4)
+
+
+class Color(Enum):
+    RED = "red"
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {Color.RED: 1},
+        {UUID("d2c1a3f6-5d8e-4a2b-9c1e-2b7f0e6a9d3c"): 1},
+        {"nested": {(1, 2): 1}},
+    ],
+)
+def test_write_json_raises_for_unsupported_keys(value):
+    with pytest.raises(TypeError):
+        json.dumps(value)
+
+    with pytest.raises(TypeError):
+        write_json(value)
+
+
+@pytest.mark.parametrize(
+    "value,expected_result",
+    [
+        ({"a": [1, "b", None, True, 0.5, 1e15]}, True),
+        ({"a": [float("nan")]}, False),
+        ({"a": {"b": 1e-05}}, False),
+        ({"a": object()}, False),
+    ],
+)
+def test_orjson_compatible(value, expected_result):
+    assert contents._orjson_compatible(value) is expected_result
@@ -1,11 +1,23 @@
+import copy
+import sys
+from io import StringIO
+
 import pytest
 
+import openapidocs.mk.v3 as v3
 from openapidocs.mk.v3 import (
     OpenAPIFileNotFoundError,
     OpenAPIV3DocumentationHandler,
+    examples,
     style_from_value,
 )
-from openapidocs.mk.v3.examples import ObjectExampleHandler
+from openapidocs.mk.v3.examples import (
+    BooleanExampleHandler,
+    ObjectExampleHandler,
+    StringExampleHandler,
+    get_example_from_schema,
+    get_handler,
+)
 from tests.common import (
     compatible_str,
     get_file_json,
@@ -26,6 +38,15 @@ def test_v3_markdown_gen(example_file):
     assert compatible_str(html, expected_result)
 
 
+def test_v3_markdown_write_to_stream():
+    handler = OpenAPIV3DocumentationHandler(get_file_json("example1-openapi.json"))
+
+    output = StringIO()
+    handler.write_to(output)
+
+    assert output.getvalue() == handler.write()
+
+
 def test_v3_markdown_gen_split_file():
     example_file = "example4-split"
     example_file_name = f"{example_file}-openapi.yaml"
@@ -52,6 +73,35 @@ def test_file_ref_raises_for_missing_file():
         )
 
 
+def test_file_ref_reads_each_file_once(monkeypatch):
+    read_sources = []
+    original_read_from_source = v3._read_from_source_cached
+
+    def read_from_source(source):
+        read_sources.append(source)
+        return original_read_from_source(source)
+
+    monkeypatch.setattr(v3, "_read_from_source_cached", read_from_source)
+
+    handler = OpenAPIV3DocumentationHandler(
+        {
+            "openapi": "3.0.0",
+            "info": {"title": "Split Public API"},
+            "components": {
+                "schemas": {
+                    "Error": {"$ref": "./spec/schemas/Error.yml"},
+                    "OtherError": {"$ref": "./spec/schemas/../schemas/Error.yml"},
+                }
+            },
+        },
+        source=get_resource_file_path("example4-split-openapi.yaml"),
+    )
+
+    schemas = handler.doc["components"]["schemas"]
+    assert schemas["Error"] is schemas["OtherError"]
+    assert len(read_sources) == 1
+
+
 @pytest.mark.parametrize(
     "input,expected_result",
     [
@@ -94,8 +144,29 @@ def test_file_ref_raises_for_missing_file():
 def test_v3_simplify_content(input, expected_result):
     handler = OpenAPIV3DocumentationHandler({})
 
+    source = copy.deepcopy(input)
+
     result = handler.simplify_content(input)
     assert result == expected_result
+    # the given content is not modified
+    assert input == source
+
+
+@pytest.mark.parametrize(
+    "content_type,is_json,is_xml",
+    [
+        ("application/json", True, False),
+        ("application/json; charset=utf-8", True, False),
+        ("text/plain", True, False),
+        ("application/vnd.api+json", True, False),
+        ("application/xml", False, True),
+        ("application/atom+xml", False, True),
+        ("text/html", False, False),
+    ],
+)
+def test_simplifiable_content_types(content_type, is_json, is_xml):
+    assert v3._can_simplify_json(content_type) is is_json
+    assert v3._can_simplify_xml(content_type) is is_xml
 
 
 def test_get_empty_schemas():
@@ -111,6 +182,33 @@ def test_get_properties_missing_data():
     assert properties == []
 
 
+def test_get_properties():
+    handler = OpenAPIV3DocumentationHandler(
+        {
+            "components": {
+                "schemas": {
+                    "Foo": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string"},
+                            "id": {"type": "string"},
+                        },
+                    }
+                }
+            }
+        }
+    )
+    foo = handler.doc["components"]["schemas"]["Foo"]
+
+    properties = handler.get_properties({"$ref": "#/components/schemas/Foo"})
+
+    assert properties == [
+        ["id", {"type": "string"}],
+        ["name", {"type": "string"}],
+    ]
+    assert handler.get_properties(foo) is properties
+
+
 def test_expand_references_ref():
     handler = OpenAPIV3DocumentationHandler(
         {
@@ -150,6 +248,18 @@ def test_expand_references_ref():
         },
     }
 
+    # schemas without references are not copied
+    ufo = handler.doc["components"]["schemas"]["Ufo"]
+    assert handler.expand_references(ufo) is ufo
+    assert (
+        exp["properties"]["id"]
+        is handler.doc["components"]["schemas"]["Foo"]["properties"]["id"]
+    )
+
+    # schemas are expanded only once
+    assert handler.expand_references({"$ref": "#/components/schemas/Foo"}) is exp
+    assert handler.expand_references(handler.doc["components"]["schemas"]["Foo"]) is exp
+
 
 def test_generate_example_from_schema_empty():
     handler = OpenAPIV3DocumentationHandler({})
@@ -181,6 +291,29 @@ def test_get_content_examples():
     assert examples[1].value == {"a": 1, "b": 2, "c": 3}
 
 
+def test_get_content_examples_generates_examples_once():
+    handler = OpenAPIV3DocumentationHandler(
+        {
+            "components": {
+                "schemas": {
+                    "Foo": {
+                        "type": "object",
+                        "properties": {"name": {"type": "string"}},
+                    }
+                }
+            }
+        }
+    )
+    content = {"schema": {"$ref": "#/components/schemas/Foo"}}
+
+    examples = list(handler.get_content_examples(content))
+
+    assert len(examples) == 1
+    assert examples[0].auto_generated is True
+    assert examples[0].value == {"name": "string"}
+    assert next(handler.get_content_examples(content)).value is examples[0].value
+
+
 def test_get_parameters_for_security_default():
     handler = OpenAPIV3DocumentationHandler({})
 
@@ -196,6 +329,83 @@ def test_get_parameters_for_security_default():
     }
 
 
+def test_get_parameters():
+    handler = OpenAPIV3DocumentationHandler(
+        {
+            "components": {
+                "parameters": {"Limit": {"name": "limit", "in": "query"}},
+                "securitySchemes": {"ApiKey": {"type": "apiKey", "in": "header"}},
+            },
+        }
+    )
+    operation = {
+        "parameters": [
+            {"name": "Offset", "in": "query"},
+            {"$ref": "#/components/parameters/Limit"},
+        ],
+        "security": [{"ApiKey": []}],
+    }
+
+    parameters = handler.get_parameters(operation)
+
+    assert [param["name"] for param in parameters] == ["ApiKey", "limit", "Offset"]
+    assert handler.get_parameters(operation) is parameters
+
+
+@pytest.mark.parametrize(
+    "path_item,expected_tag",
+    [
+        ({}, None),
+        ({"get": {}}, None),
+        ({"get": {"tags": ["Cats"]}}, "Cats"),
+        ({"get": {"tags": ["Cats"]}, "post": {"tags": ["Cats"]}}, "Cats"),
+        ({"get": {"tags": ["Cats"]}, "post": {}}, "Cats"),
+        ({"get": {"tags": ["Cats", "Pets"]}, "post": {"tags": ["Pets"]}}, "Pets"),
+        (
+            {"get": {"tags": ["Pets", "Cats"]}, "post": {"tags": ["Cats", "Pets"]}},
+            "Pets",
+        ),
+        ({"get": {"tags": ["Cats"]}, "post": {"tags": ["Dogs"]}}, None),
+        (
+            {
+                "get": {"tags": ["Cats"]},
+                "post": {"tags": ["Dogs"]},
+                "put": {"tags": ["Dogs"]},
+            },
+            None,
+        ),
+    ],
+)
+def test_get_tag(path_item, expected_tag):
+    handler = OpenAPIV3DocumentationHandler({})
+
+    assert handler.get_tag(path_item) == expected_tag
+
+
+def test_v3_handler_resolves_operations_references():
+    handler = OpenAPIV3DocumentationHandler(
+        {
+            "paths": {
+                "/cats": {
+                    "post": {
+                        "parameters": [{"$ref": "#/components/parameters/Limit"}],
+                        "requestBody": {"$ref": "#/components/requestBodies/Cat"},
+                    }
+                }
+            },
+            "components": {
+                "parameters": {"Limit": {"name": "limit", "in": "query"}},
+                "requestBodies": {"Cat": {"content": {}}},
+            },
+        }
+    )
+
+    operation = handler.doc["paths"]["/cats"]["post"]
+    components = handler.doc["components"]
+    assert operation["parameters"][0] is components["parameters"]["Limit"]
+    assert operation["requestBody"] is components["requestBodies"]["Cat"]
+
+
 def test_iter_bindings():
     handler = OpenAPIV3DocumentationHandler(get_file_json("example1-openapi.json"))
 
@@ -286,6 +496,77 @@ def test_v3_markdown_gen_handles_missing_components():
     assert html is not None
 
 
+def test_v3_handler_copies_document_interning_keys():
+    data = {
+        "openapi": "3.0.0",
+        "info": {"version": "1.0.0", "title": "Example"},
+        "paths": {},
+        "".join(["compo", "nents"]): {
+            "schemas": {
+                "Foo": {"".join(["ty", "pe"]): "".join(["obj", "ect"]), "required": []}
+            }
+        },
+    }
+
+    handler = OpenAPIV3DocumentationHandler(data)
+
+    assert handler.doc == data
+    assert handler.doc is not data
+    assert handler.doc["components"] is not data["components"]
+    schema = handler.doc["components"]["schemas"]["Foo"]
+    assert schema["required"] is not data["components"]["schemas"]["Foo"]["required"]
+    assert list(handler.doc)[3] is sys.intern("components")
+    assert list(schema)[0] is sys.intern("type")
+    assert schema["type"] is sys.intern("object")
+
+
+def test_v3_handler_does_not_modify_source_document():
+    data = {
+        "openapi": "3.0.0",
+        "info": {"version": "1.0.0", "title": "Example"},
+        "paths": {},
+    }
+
+    handler = OpenAPIV3DocumentationHandler(data)
+
+    assert handler.doc["components"] == {}
+    assert "components" not in data
+
+
+def test_resolve_reference_caches_values():
+    handler = OpenAPIV3DocumentationHandler(get_file_json("example1-openapi.json"))
+    reference = "#/components/schemas/Country"
+
+    value = handler.resolve_reference(reference)
+
+    assert value is handler.doc["components"]["schemas"]["Country"]
+    assert handler.resolve_reference({"$ref": reference}) is value
+    assert handler._references_cache[reference] is value
+    assert handler.resolve_reference("#/components/schemas/Missing") is None
+
+
+def test_v3_handlers_share_writers_by_style():
+    handler_1 = OpenAPIV3DocumentationHandler({}, style=1)
+    handler_2 = OpenAPIV3DocumentationHandler({}, style="MKDOCS")
+    handler_3 = OpenAPIV3DocumentationHandler({}, style=2)
+
+    assert handler_1._writer is handler_2._writer
+    assert handler_1._writer is not handler_3._writer
+
+
+def test_v3_handler_groups_operations_once():
+    handler = OpenAPIV3DocumentationHandler(get_file_json("example1-openapi.json"))
+
+    operations = handler.get_operations()
+    schemas = handler.get_schemas()
+
+    assert handler.get_operations() is operations
+    assert handler.get_schemas() is schemas
+    assert [name for name, _ in schemas] == sorted(
+        handler.doc["components"]["schemas"], key=str.lower
+    )
+
+
 def test_object_example_handler_handles_missing_pros():
     handler = ObjectExampleHandler()
 
@@ -310,3 +591,25 @@ def test_v3_markdown_yaml(example_file):
     html = handler.write()
 
     compatible_str(html, expected_result)
+
+
+def test_get_example_handler():
+    handler = get_handler("string")
+
+    assert isinstance(handler, StringExampleHandler)
+    assert get_handler("string") is handler
+    assert get_handler("object") is not None
+    assert get_handler("foo") is None
+    assert get_handler(["string", "null"]) is None
+
+
+def test_example_handlers_can_be_replaced_by_subclasses(monkeypatch):
+    # restore the default handlers after the test
+    monkeypatch.setattr(examples, "_handlers_types", dict(examples._handlers_types))
+    monkeypatch.setattr(examples, "HANDLERS", {})
+
+    class CustomBooleanExampleHandler(BooleanExampleHandler):
+        default = False
+
+    assert isinstance(get_handler("boolean"), CustomBooleanExampleHandler)
+    assert get_example_from_schema({"type": "boolean"}) is False
@@ -1,3 +1,4 @@
+import sys
 from abc import abstractmethod
 from dataclasses import dataclass
 from textwrap import dedent
@@ -9,6 +10,7 @@ from openapidocs.common import Format, Serializer
 from openapidocs.v2 import (
     APIKeyLocation,
     APIKeySecurity,
+    BasicSecurity,
     CollectionFormat,
     Contact,
     ExternalDocs,
@@ -32,6 +34,7 @@ from openapidocs.v2 import (
     ValueItemType,
     ValueType,
     get_ref,
+    iter_schemas,
 )
 from tests.common import debug_result
 
@@ -1316,3 +1319,43 @@ def test_equality(example_type: Type[TestItem]) -> None:
 )
 def test_get_ref(value, expected_result):
     assert get_ref(value) == expected_result
+    assert get_ref(value) is get_ref(value)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="Requires Python 3.10")
+def test_elements_use_slots():
+    schema = Schema(type=ValueType.STRING)
+
+    assert not hasattr(schema, "__dict__")
+    assert not hasattr(OpenAPI(), "__dict__")
+    assert not hasattr(BasicSecurity(), "__dict__")
+
+
+def test_iter_schemas():
+    reference = Reference("#/definitions/Cat")
+    name = Schema(type=ValueType.STRING)
+    tag = Schema(type=ValueType.STRING)
+    tags = Schema(type=ValueType.ARRAY, items=tag)
+    pet = Schema(type=ValueType.OBJECT, properties={"name": name, "tags": tags})
+    root = Schema(all_of=[pet, reference])
+
+    assert list(iter_schemas(root)) == [root, pet, name, tags, tag, reference]
+    assert list(iter_schemas(reference)) == [reference]
+
+
+def test_iter_schemas_deep_schema():
+    root = schema = Schema(type=ValueType.ARRAY)
+
+    for _ in range(5000):
+        schema.items = Schema(type=ValueType.ARRAY)
+        schema = schema.items
+
+    assert sum(1 for _ in iter_schemas(root)) == 5001
+
+
+def test_iter_schemas_cycle():
+    node = Schema(type=ValueType.OBJECT)
+    children = Schema(type=ValueType.ARRAY, items=node)
+    node.properties = {"children": children, "parent": node}
+
+    assert list(iter_schemas(node)) == [node, children]
@@ -1,4 +1,5 @@
 import os
+import sys
 from abc import abstractmethod
 from dataclasses import dataclass
 from datetime import date, datetime, time
@@ -2446,3 +2447,37 @@ def test_serialize_datetimes_examples_exact_format_env():
         assert json_text == expected_json
     finally:
         os.environ["OPENAPI_DATETIME_FORMAT"] = ""
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="Requires Python 3.10")
+def test_elements_use_slots():
+    schema = Schema(type=ValueType.STRING)
+
+    assert not hasattr(schema, "__dict__")
+    assert not hasattr(OpenAPI(), "__dict__")
+    assert not hasattr(HTTPSecurity(scheme="basic"), "__dict__")
+
+
+def test_serialize_reference_cycle():
+    schema = Schema(type=ValueType.OBJECT)
+    schema.properties = {"children": Schema(type=ValueType.ARRAY, items=schema)}
+    doc = OpenAPI(components=Components(schemas={"Node": schema}))
+
+    with pytest.raises(ValueError) as error:
+        Serializer().to_yaml(doc)
+
+    assert isinstance(error.value.__cause__, RecursionError)
+    assert (
+        "OpenAPI.components.schemas['Node'].properties['children'].items is "
+        "OpenAPI.components.schemas['Node']"
+    ) in str(error.value)
+
+
+def test_serialize_deeply_nested_schema():
+    schema = Schema(type=ValueType.STRING)
+    for _ in range(5000):
+        schema = Schema(type=ValueType.ARRAY, items=schema)
+
+    # deep nesting is not reported as a cycle
+    with pytest.raises(RecursionError):
+        Serializer().to_obj(schema)